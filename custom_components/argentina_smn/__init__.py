@@ -1,23 +1,37 @@
 """The SMN Weather integration."""
 from __future__ import annotations
 
+from dataclasses import dataclass
+from functools import partial
 import logging
+from types import MappingProxyType
 from typing import Any
 
+import aiohttp
 import voluptuous as vol
+from yarl import URL
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE, Platform
 from homeassistant.core import HomeAssistant, ServiceCall
 from homeassistant.helpers import config_validation as cv
-
-from .const import ALERT_EVENT_MAP, ALERT_LEVEL_MAP, DOMAIN
-from .coordinator import ArgentinaSMNDataUpdateCoordinator
+from homeassistant.helpers.typing import ConfigType
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util.json import json_loads
+
+from .const import ALERT_EVENT_MAP, ALERT_LEVEL_MAP, API_ALERT_ENDPOINT, DOMAIN
+from .coordinator import (
+    ArgentinaSMNDataUpdateCoordinator,
+    async_get_bulkhead,
+    index_reports,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS = [Platform.WEATHER, Platform.BINARY_SENSOR]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
 # Service names
 SERVICE_GET_ALERTS = "get_alerts"
 SERVICE_GET_ALERTS_FOR_LOCATION = "get_alerts_for_location"
@@ -35,67 +49,155 @@ SERVICE_GET_ALERTS_FOR_LOCATION_SCHEMA = vol.Schema(
     }
 )
 
+# hass.data key holding the entry id services fall back to; kept outside
+# hass.data[DOMAIN] so that dict only maps entry ids to coordinators
+DATA_DEFAULT_ENTRY = f"{DOMAIN}_default_entry"
+
+# Base URL for per-location alert lookups, parsed once
+_ALERT_URL = URL(API_ALERT_ENDPOINT)
+
+# Result returned when there is no alerts data to parse, also used as the
+# base for service error responses
+_EMPTY_RESULT = MappingProxyType(
+    {"active_alerts": (), "max_severity": "info", "area_id": None}
+)
+
+# Template for parsed alerts data without any warning events
+_NO_ALERTS_RESULT = MappingProxyType(
+    {
+        "active_alerts": (),
+        "max_severity": ALERT_LEVEL_MAP[1]["severity"],
+        "max_level": 1,
+        "area_id": None,
+        "updated": None,
+    }
+)
+
+# Shared immutable defaults for missing keys, to avoid per-lookup allocations
+_EMPTY_TUPLE: tuple = ()
+_NO_LEVELS: MappingProxyType = MappingProxyType({})
+_NO_REPORT = (None, None)
+
+# Fallback level info for unknown alert levels
+_LEVEL_ONE = ALERT_LEVEL_MAP[1]
+_LEVEL_MAP_GET = ALERT_LEVEL_MAP.get
+
+# Last parsed alerts per config entry: (raw alerts, "updated" stamp, parsed)
+_PARSE_CACHE: dict[str, tuple[dict[str, Any], Any, dict[str, Any]]] = {}
+
+
+def _empty_result(**extra: Any) -> dict[str, Any]:
+    """Return the empty result with a fresh active alerts list."""
+    return {**_EMPTY_RESULT, "active_alerts": [], **extra}
+
+
+@dataclass(slots=True, frozen=True)
+class ActiveAlert:
+    """An active alert for a single weather event."""
+
+    event_id: int
+    event_name: str
+    max_level: int
+    level_name: str
+    color: str
+    severity: str
+    date: str | None
+    description: str | None
+    instruction: str | None
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the alert as a service response dict."""
+        return {
+            "event_id": self.event_id,
+            "event_name": self.event_name,
+            "max_level": self.max_level,
+            "level_name": self.level_name,
+            "color": self.color,
+            "severity": self.severity,
+            "date": self.date,
+            "description": self.description,
+            "instruction": self.instruction,
+        }
+
 
 def _parse_alerts(alerts_data: dict[str, Any]) -> dict[str, Any]:
     """Parse raw alerts data into structured format for automations."""
     if not alerts_data or not isinstance(alerts_data, dict):
-        return {"active_alerts": [], "max_severity": "info", "area_id": None}
+        return _empty_result()
 
-    warnings = alerts_data.get("warnings", [])
-    reports = alerts_data.get("reports", [])
+    warnings = alerts_data.get("warnings", _EMPTY_TUPLE)
     area_id = alerts_data.get("area_id")
 
+    # Fast path for the usual case of no warning events
+    if not warnings or not warnings[0].get("events"):
+        return {
+            **_NO_ALERTS_RESULT,
+            "active_alerts": [],
+            "area_id": area_id,
+            "updated": alerts_data.get("updated"),
+        }
+
+    reports = alerts_data.get("reports", _EMPTY_TUPLE)
+
     active_alerts = []
-    max_severity_level = 1
+    append = active_alerts.append
 
     # Get current day's warnings
-    if warnings and len(warnings) > 0:
-        current_warning = warnings[0]
-        events = current_warning.get("events", [])
-
-        for event in events:
-            event_id = event.get("id")
-            max_level = event.get("max_level", 1)
-
-            # Skip level 1 (no alert)
-            if max_level <= 1:
-                continue
-
-            # Track max severity
-            max_severity_level = max(max_severity_level, max_level)
-
-            # Get event name
-            event_name = ALERT_EVENT_MAP.get(event_id, f"unknown_{event_id}")
-
-            # Get level info
-            level_info = ALERT_LEVEL_MAP.get(max_level, ALERT_LEVEL_MAP[1])
-
-            # Find report for this event
-            description = None
-            instruction = None
-            for report in reports:
-                if report.get("event_id") == event_id:
-                    levels = report.get("levels", [])
-                    for level_data in levels:
-                        if level_data.get("level") == max_level:
-                            description = level_data.get("description")
-                            instruction = level_data.get("instruction")
-                            break
-
-            active_alerts.append({
-                "event_id": event_id,
-                "event_name": event_name,
-                "max_level": max_level,
-                "level_name": level_info["name"],
-                "color": level_info["color"],
-                "severity": level_info["severity"],
-                "date": current_warning.get("date"),
-                "description": description,
-                "instruction": instruction,
-            })
+    current_warning = warnings[0]
+    events = current_warning.get("events", _EMPTY_TUPLE)
+
+    # Overall max severity, in a single C-level max() call
+    max_severity_level = max(
+        (event.get("max_level", 1) for event in events), default=1
+    )
+    if max_severity_level < 1:
+        max_severity_level = 1
+
+    # Built on the first active event, so quiet days never pay for it
+    reports_index = None
+
+    # Local aliases for the per-event lookups
+    event_map_get = ALERT_EVENT_MAP.get
+    level_map_get = _LEVEL_MAP_GET
+    level_one = _LEVEL_ONE
+
+    for event in events:
+        event_id = event.get("id")
+        max_level = event.get("max_level", 1)
+
+        # Skip level 1 (no alert)
+        if max_level <= 1:
+            continue
+
+        # Get event name
+        event_name = event_map_get(event_id) or f"unknown_{event_id}"
+
+        # Get level info
+        level_info = level_map_get(max_level, level_one)
+
+        # Find report for this event
+        if reports_index is None:
+            reports_index = index_reports(reports)
+        description, instruction = reports_index.get(event_id, _NO_LEVELS).get(
+            max_level, _NO_REPORT
+        )
+
+        append(
+            ActiveAlert(
+                event_id=event_id,
+                event_name=event_name,
+                max_level=max_level,
+                level_name=level_info["name"],
+                color=level_info["color"],
+                severity=level_info["severity"],
+                date=current_warning.get("date"),
+                description=description,
+                instruction=instruction,
+            )
+        )
 
     # Get overall max severity
-    max_severity_info = ALERT_LEVEL_MAP.get(max_severity_level, ALERT_LEVEL_MAP[1])
+    max_severity_info = _LEVEL_MAP_GET(max_severity_level, _LEVEL_ONE)
 
     return {
         "active_alerts": active_alerts,
@@ -106,6 +208,130 @@ def _parse_alerts(alerts_data: dict[str, Any]) -> dict[str, Any]:
     }
 
 
+def _alerts_response(result: dict[str, Any]) -> dict[str, Any]:
+    """Convert parsed alerts into a service response."""
+    return {
+        **result,
+        "active_alerts": [alert.as_dict() for alert in result["active_alerts"]],
+    }
+
+
+def _parse_alerts_cached(entry_id: str, alerts_data: dict[str, Any]) -> dict[str, Any]:
+    """Return a fresh alerts response, reparsing only when the data changes."""
+    updated = alerts_data.get("updated") if isinstance(alerts_data, dict) else None
+    cached = _PARSE_CACHE.get(entry_id)
+    if cached and cached[0] is alerts_data and cached[1] == updated:
+        return _alerts_response(cached[2])
+
+    result = _parse_alerts(alerts_data)
+    _PARSE_CACHE[entry_id] = (alerts_data, updated, result)
+    return _alerts_response(result)
+
+
+async def _handle_get_alerts(hass: HomeAssistant, call: ServiceCall) -> dict[str, Any]:
+    """Handle get_alerts service call."""
+    config_entry_id = call.data.get("config_entry_id")
+
+    # If no config_entry_id provided, use the first one
+    if not config_entry_id:
+        if hass.data.get(DOMAIN):
+            config_entry_id = hass.data[DATA_DEFAULT_ENTRY]
+        else:
+            _LOGGER.error("No SMN integration configured")
+            return _empty_result()
+
+    # Get coordinator
+    coordinator = hass.data[DOMAIN].get(config_entry_id)
+    if not coordinator:
+        _LOGGER.warning(
+            "Invalid config_entry_id: %s. Use the integration's config entry ID, not location ID. "
+            "Leave empty to use the default integration.",
+            config_entry_id
+        )
+        return _empty_result()
+
+    # Alerts are skipped while nothing uses them; fetch them on first use
+    if not coordinator.alerts_requested:
+        coordinator.alerts_requested = True
+        if not coordinator.data.alerts_required:
+            await coordinator.async_refresh()
+
+    # Parse and return alerts
+    result = _parse_alerts_cached(config_entry_id, coordinator.data.alerts)
+    _LOGGER.info(
+        "Alerts service called: found %d active alerts with max severity '%s'",
+        len(result.get("active_alerts", [])),
+        result.get("max_severity", "info")
+    )
+    return result
+
+
+async def _handle_get_alerts_for_location(
+    hass: HomeAssistant, call: ServiceCall
+) -> dict[str, Any]:
+    """Handle get_alerts_for_location service call."""
+    location_id = call.data.get("location_id")
+
+    # Get token manager from first available coordinator
+    if not hass.data.get(DOMAIN):
+        _LOGGER.error("No SMN integration configured. Set up integration first.")
+        return _empty_result()
+
+    # Get first coordinator to access token manager
+    coordinator = hass.data[DOMAIN][hass.data[DATA_DEFAULT_ENTRY]]
+
+    # Fetch alerts directly from API
+    try:
+        headers = await coordinator._smn_data._token_manager.get_headers()
+
+        url = _ALERT_URL / location_id
+        _LOGGER.info("Fetching alerts for location ID: %s", location_id)
+
+        async with async_get_bulkhead(hass), coordinator.session.get(
+            url, headers=headers
+        ) as response:
+            response.raise_for_status()
+            data = json_loads(await response.read())
+
+        # Parse and return alerts
+        result = _alerts_response(_parse_alerts(data))
+        _LOGGER.info(
+            "Fetched alerts for location %s: %d active alerts with max severity '%s'",
+            location_id,
+            len(result.get("active_alerts", [])),
+            result.get("max_severity", "info")
+        )
+        return result
+
+    except (aiohttp.ClientError, TimeoutError, ValueError, UpdateFailed) as err:
+        _LOGGER.error("Error fetching alerts for location %s: %s", location_id, err)
+        return _empty_result(error=str(err))
+
+
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_ALERTS,
+        partial(_handle_get_alerts, hass),
+        schema=SERVICE_GET_ALERTS_SCHEMA,
+        supports_response="only",
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_ALERTS_FOR_LOCATION,
+        partial(_handle_get_alerts_for_location, hass),
+        schema=SERVICE_GET_ALERTS_FOR_LOCATION_SCHEMA,
+        supports_response="only",
+    )
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the SMN integration."""
+    _async_register_services(hass)
+    return True
+
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up SMN from a config entry."""
     # Create coordinator
@@ -115,107 +341,9 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     await coordinator.async_config_entry_first_refresh()
 
     # Store coordinator
-    hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = coordinator
-
-    # Register services (only once)
-    if not hass.services.has_service(DOMAIN, SERVICE_GET_ALERTS):
-        async def handle_get_alerts(call: ServiceCall) -> dict[str, Any]:
-            """Handle get_alerts service call."""
-            config_entry_id = call.data.get("config_entry_id")
-
-            # If no config_entry_id provided, use the first one
-            if not config_entry_id:
-                if hass.data.get(DOMAIN):
-                    config_entry_id = next(iter(hass.data[DOMAIN]))
-                else:
-                    _LOGGER.error("No SMN integration configured")
-                    return {"active_alerts": [], "max_severity": "info", "area_id": None}
-
-            # Get coordinator
-            coordinator = hass.data[DOMAIN].get(config_entry_id)
-            if not coordinator:
-                _LOGGER.warning(
-                    "Invalid config_entry_id: %s. Use the integration's config entry ID, not location ID. "
-                    "Leave empty to use the default integration.",
-                    config_entry_id
-                )
-                return {"active_alerts": [], "max_severity": "info", "area_id": None}
-
-            # Parse and return alerts
-            result = _parse_alerts(coordinator.data.alerts)
-            _LOGGER.info(
-                "Alerts service called: found %d active alerts with max severity '%s'",
-                len(result.get("active_alerts", [])),
-                result.get("max_severity", "info")
-            )
-            return result
-
-        hass.services.async_register(
-            DOMAIN,
-            SERVICE_GET_ALERTS,
-            handle_get_alerts,
-            schema=SERVICE_GET_ALERTS_SCHEMA,
-            supports_response="only",
-        )
-
-    # Register get_alerts_for_location service (only once)
-    if not hass.services.has_service(DOMAIN, SERVICE_GET_ALERTS_FOR_LOCATION):
-        async def handle_get_alerts_for_location(call: ServiceCall) -> dict[str, Any]:
-            """Handle get_alerts_for_location service call."""
-            location_id = call.data.get("location_id")
-
-            # Get token manager from first available coordinator
-            if not hass.data.get(DOMAIN):
-                _LOGGER.error("No SMN integration configured. Set up integration first.")
-                return {"active_alerts": [], "max_severity": "info", "area_id": None}
-
-            # Get first coordinator to access token manager
-            first_entry_id = next(iter(hass.data[DOMAIN]))
-            coordinator = hass.data[DOMAIN][first_entry_id]
-
-            # Fetch alerts directly from API
-            try:
-                import aiohttp
-                import async_timeout
-                from .const import API_ALERT_ENDPOINT
-
-                token = await coordinator._smn_data._token_manager.get_token()
-                headers = {
-                    "Authorization": f"JWT {token}",
-                    "Accept": "application/json",
-                }
-
-                url = f"{API_ALERT_ENDPOINT}/{location_id}"
-                _LOGGER.info("Fetching alerts for location ID: %s", location_id)
-
-                async with async_timeout.timeout(10):
-                    session = coordinator._smn_data._session
-                    response = await session.get(url, headers=headers)
-                    response.raise_for_status()
-                    data = await response.json()
-
-                # Parse and return alerts
-                result = _parse_alerts(data)
-                _LOGGER.info(
-                    "Fetched alerts for location %s: %d active alerts with max severity '%s'",
-                    location_id,
-                    len(result.get("active_alerts", [])),
-                    result.get("max_severity", "info")
-                )
-                return result
-
-            except Exception as err:
-                _LOGGER.error("Error fetching alerts for location %s: %s", location_id, err)
-                return {"active_alerts": [], "max_severity": "info", "area_id": None, "error": str(err)}
-
-        hass.services.async_register(
-            DOMAIN,
-            SERVICE_GET_ALERTS_FOR_LOCATION,
-            handle_get_alerts_for_location,
-            schema=SERVICE_GET_ALERTS_FOR_LOCATION_SCHEMA,
-            supports_response="only",
-        )
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    domain_data[entry.entry_id] = coordinator
+    hass.data.setdefault(DATA_DEFAULT_ENTRY, entry.entry_id)
 
     # Set up platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
@@ -228,6 +356,16 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        domain_data = hass.data[DOMAIN]
+        coordinator = domain_data.pop(entry.entry_id)
+        await coordinator.async_shutdown()
+        _PARSE_CACHE.pop(entry.entry_id, None)
+
+        # Fall back to the next remaining entry for services
+        if hass.data.get(DATA_DEFAULT_ENTRY) == entry.entry_id:
+            if domain_data:
+                hass.data[DATA_DEFAULT_ENTRY] = next(iter(domain_data))
+            else:
+                hass.data.pop(DATA_DEFAULT_ENTRY)
 
     return unload_ok
@@ -26,6 +26,9 @@ EVENT_ALERT_CREATED = f"{DOMAIN}_alert_created"
 EVENT_ALERT_UPDATED = f"{DOMAIN}_alert_updated"
 EVENT_ALERT_CLEARED = f"{DOMAIN}_alert_cleared"
 
+# Fallback level info for unknown alert levels
+_DEFAULT_LEVEL = ALERT_LEVEL_MAP[1]
+
 
 async def async_setup_entry(
     hass: HomeAssistant,
@@ -103,7 +106,6 @@ class SMNAlertSensor(CoordinatorEntity[ArgentinaSMNDataUpdateCoordinator], Binar
             return {}
 
         warnings = self.coordinator.data.alerts.get("warnings", [])
-        reports = self.coordinator.data.alerts.get("reports", [])
 
         if not warnings or len(warnings) == 0:
             return {
@@ -116,6 +118,7 @@ class SMNAlertSensor(CoordinatorEntity[ArgentinaSMNDataUpdateCoordinator], Binar
         events = current_warning.get("events", [])
 
         # Count active alerts and find max severity
+        reports_index = self.coordinator.reports_index
         active_alerts = []
         max_level = 1
 
@@ -123,20 +126,13 @@ class SMNAlertSensor(CoordinatorEntity[ArgentinaSMNDataUpdateCoordinator], Binar
             event_level = event.get("max_level", 1)
             if event_level > 1:
                 event_id = event.get("id")
-                event_name = ALERT_EVENT_MAP.get(event_id, f"unknown_{event_id}")
-                level_info = ALERT_LEVEL_MAP.get(event_level, ALERT_LEVEL_MAP[1])
+                event_name = ALERT_EVENT_MAP.get(event_id) or f"unknown_{event_id}"
+                level_info = ALERT_LEVEL_MAP.get(event_level, _DEFAULT_LEVEL)
 
                 # Find description from reports
-                description = None
-                instruction = None
-                for report in reports:
-                    if report.get("event_id") == event_id:
-                        levels = report.get("levels", [])
-                        for level_data in levels:
-                            if level_data.get("level") == event_level:
-                                description = level_data.get("description")
-                                instruction = level_data.get("instruction")
-                                break
+                description = reports_index.get(event_id, {}).get(
+                    event_level, (None, None)
+                )[0]
 
                 active_alerts.append({
                     "event_name": event_name,
@@ -146,7 +142,7 @@ class SMNAlertSensor(CoordinatorEntity[ArgentinaSMNDataUpdateCoordinator], Binar
                 })
                 max_level = max(max_level, event_level)
 
-        max_severity_info = ALERT_LEVEL_MAP.get(max_level, ALERT_LEVEL_MAP[1])
+        max_severity_info = ALERT_LEVEL_MAP.get(max_level, _DEFAULT_LEVEL)
         alert_summary = ", ".join([f"{a['event_name']} ({a['level_name']})" for a in active_alerts])
 
         return {
@@ -177,7 +173,7 @@ class SMNAlertSensor(CoordinatorEntity[ArgentinaSMNDataUpdateCoordinator], Binar
 
         current_warning = warnings[0]
         events = current_warning.get("events", [])
-        reports = self.coordinator.data.alerts.get("reports", [])
+        reports_index = self.coordinator.reports_index
 
         # Build current alerts set
         current_alerts: set[tuple[int, int]] = set()
@@ -190,18 +186,11 @@ class SMNAlertSensor(CoordinatorEntity[ArgentinaSMNDataUpdateCoordinator], Binar
         # Find new alerts
         new_alerts = current_alerts - self._previous_alerts
         for event_id, level in new_alerts:
-            event_name = ALERT_EVENT_MAP.get(event_id, f"unknown_{event_id}")
-            level_info = ALERT_LEVEL_MAP.get(level, ALERT_LEVEL_MAP[1])
+            event_name = ALERT_EVENT_MAP.get(event_id) or f"unknown_{event_id}"
+            level_info = ALERT_LEVEL_MAP.get(level, _DEFAULT_LEVEL)
 
             # Find description
-            description = None
-            for report in reports:
-                if report.get("event_id") == event_id:
-                    levels = report.get("levels", [])
-                    for level_data in levels:
-                        if level_data.get("level") == level:
-                            description = level_data.get("description")
-                            break
+            description = reports_index.get(event_id, {}).get(level, (None, None))[0]
 
             self.hass.bus.fire(
                 EVENT_ALERT_CREATED,
@@ -227,8 +216,8 @@ class SMNAlertSensor(CoordinatorEntity[ArgentinaSMNDataUpdateCoordinator], Binar
             # Check if level changed
             old_level = next((l for eid, l in self._previous_alerts if eid == event_id), None)
             if old_level and old_level != level:
-                event_name = ALERT_EVENT_MAP.get(event_id, f"unknown_{event_id}")
-                level_info = ALERT_LEVEL_MAP.get(level, ALERT_LEVEL_MAP[1])
+                event_name = ALERT_EVENT_MAP.get(event_id) or f"unknown_{event_id}"
+                level_info = ALERT_LEVEL_MAP.get(level, _DEFAULT_LEVEL)
 
                 self.hass.bus.fire(
                     EVENT_ALERT_UPDATED,
@@ -251,7 +240,7 @@ class SMNAlertSensor(CoordinatorEntity[ArgentinaSMNDataUpdateCoordinator], Binar
         # Find cleared alerts
         cleared_alerts = self._previous_alerts - current_alerts
         for event_id, level in cleared_alerts:
-            event_name = ALERT_EVENT_MAP.get(event_id, f"unknown_{event_id}")
+            event_name = ALERT_EVENT_MAP.get(event_id) or f"unknown_{event_id}"
 
             self.hass.bus.fire(
                 EVENT_ALERT_CLEARED,
@@ -329,26 +318,18 @@ class SMNEventAlertSensor(CoordinatorEntity[ArgentinaSMNDataUpdateCoordinator],
             return {"level": 1, "severity": "info"}
 
         warnings = self.coordinator.data.alerts.get("warnings", [])
-        reports = self.coordinator.data.alerts.get("reports", [])
         current_warning = warnings[0]
         events = current_warning.get("events", [])
 
         for event in events:
             if event.get("id") == self._event_id:
                 level = event.get("max_level", 1)
-                level_info = ALERT_LEVEL_MAP.get(level, ALERT_LEVEL_MAP[1])
+                level_info = ALERT_LEVEL_MAP.get(level, _DEFAULT_LEVEL)
 
                 # Find description from reports
-                description = None
-                instruction = None
-                for report in reports:
-                    if report.get("event_id") == self._event_id:
-                        levels = report.get("levels", [])
-                        for level_data in levels:
-                            if level_data.get("level") == level:
-                                description = level_data.get("description")
-                                instruction = level_data.get("instruction")
-                                break
+                description, instruction = self.coordinator.reports_index.get(
+                    self._event_id, {}
+                ).get(level, (None, None))
 
                 return {
                     "event_id": self._event_id,
@@ -1,6 +1,7 @@
 """Config flow for SMN Weather integration."""
 from __future__ import annotations
 
+from functools import lru_cache
 import logging
 from typing import Any
 
@@ -44,6 +45,18 @@ async def async_validate_location(
     return None
 
 
+@lru_cache(maxsize=4)
+def _build_user_schema(default_latitude: float, default_longitude: float) -> vol.Schema:
+    """Return the user step schema pre-filled with the given coordinates."""
+    return vol.Schema(
+        {
+            vol.Required(CONF_LATITUDE, default=default_latitude): cv.latitude,
+            vol.Required(CONF_LONGITUDE, default=default_longitude): cv.longitude,
+            vol.Optional(CONF_NAME): cv.string,
+        }
+    )
+
+
 class ArgentinaSMNConfigFlow(ConfigFlow, domain=DOMAIN):
     """Handle a config flow for SMN Weather."""
 
@@ -138,16 +151,8 @@ class ArgentinaSMNConfigFlow(ConfigFlow, domain=DOMAIN):
                     )
 
         # Show form - pre-fill with home coordinates
-        data_schema = vol.Schema(
-            {
-                vol.Required(
-                    CONF_LATITUDE, default=self.hass.config.latitude
-                ): cv.latitude,
-                vol.Required(
-                    CONF_LONGITUDE, default=self.hass.config.longitude
-                ): cv.longitude,
-                vol.Optional(CONF_NAME): cv.string,
-            }
+        data_schema = _build_user_schema(
+            self.hass.config.latitude, self.hass.config.longitude
         )
 
         return self.async_show_form(
@@ -1,4 +1,5 @@
 """Constants for the SMN integration."""
+from types import MappingProxyType
 from typing import Final
 
 from homeassistant.components.weather import (
@@ -39,8 +40,14 @@ TOKEN_URL: Final = "https://ws2.smn.gob.ar/"
 DEFAULT_HOME_LATITUDE: Final = -34.6037
 DEFAULT_HOME_LONGITUDE: Final = -58.3816
 
+# Config entry keys caching the SMN location ID resolved for the coordinates
+CONF_CACHED_LOCATION_ID: Final = "cached_location_id"
+CONF_CACHED_COORDS: Final = "cached_coords"
+
 # Update intervals
 DEFAULT_SCAN_INTERVAL: Final = 3600  # 1 hour in seconds
+# Minimum seconds between refreshes requested outside the regular schedule
+REQUEST_REFRESH_COOLDOWN: Final = 30
 
 # Weather condition ID mappings - SMN ID to HA condition
 # Based on SMN's official weather icon reference table
@@ -127,7 +134,7 @@ ATTR_MAP: Final = {
 }
 
 # Alert event ID mappings - SMN event ID to event name
-ALERT_EVENT_MAP: Final = {
+ALERT_EVENT_MAP: Final = MappingProxyType({
     37: "lluvia",  # Rain
     39: "viento",  # Wind
     40: "niebla",  # Fog
@@ -139,7 +146,7 @@ ALERT_EVENT_MAP: Final = {
     46: "polvo",  # Dust
     47: "viento_zonda",  # Zonda wind
     54: "humo",  # Smoke
-}
+})
 
 # Alert event icon mappings - event name to MDI icon
 ALERT_EVENT_ICONS: Final = {
@@ -157,10 +164,10 @@ ALERT_EVENT_ICONS: Final = {
 }
 
 # Alert level mappings - SMN alert level to severity
-ALERT_LEVEL_MAP: Final = {
-    1: {"name": "none", "color": "white", "severity": "info"},
-    2: {"name": "advertencia", "color": "violeta", "severity": "warning"},  # Advisory
-    3: {"name": "amarillo", "color": "amarillo", "severity": "warning"},  # Yellow alert
-    4: {"name": "naranja", "color": "naranja", "severity": "error"},  # Orange alert
-    5: {"name": "rojo", "color": "rojo", "severity": "error"},  # Red alert
-}
+ALERT_LEVEL_MAP: Final = MappingProxyType({
+    1: MappingProxyType({"name": "none", "color": "white", "severity": "info"}),
+    2: MappingProxyType({"name": "advertencia", "color": "violeta", "severity": "warning"}),  # Advisory
+    3: MappingProxyType({"name": "amarillo", "color": "amarillo", "severity": "warning"}),  # Yellow alert
+    4: MappingProxyType({"name": "naranja", "color": "naranja", "severity": "error"}),  # Orange alert
+    5: MappingProxyType({"name": "rojo", "color": "rojo", "severity": "error"}),  # Red alert
+})
@@ -1,23 +1,28 @@
 """DataUpdateCoordinator for the SMN integration."""
 from __future__ import annotations
 
-import base64
+import asyncio
 from datetime import datetime, timedelta
-import json
+from itertools import islice
 import logging
+import random
 import re
+import time
 from typing import Any
+import zlib
 
 import aiohttp
-import async_timeout
+import jwt
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
-from homeassistant.core import Event, HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.event import async_track_state_change_event, async_call_later
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.helpers.debounce import Debouncer
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
 
 from .const import (
     API_ALERT_ENDPOINT,
@@ -26,41 +31,201 @@ from .const import (
     API_HEAT_WARNING_ENDPOINT,
     API_SHORTTERM_ALERT_ENDPOINT,
     API_WEATHER_ENDPOINT,
+    CONF_CACHED_COORDS,
+    CONF_CACHED_LOCATION_ID,
     DEFAULT_SCAN_INTERVAL,
     DOMAIN,
+    REQUEST_REFRESH_COOLDOWN,
     TOKEN_URL,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
+# Refresh the token this many seconds before it expires
+_TOKEN_EXPIRY_MARGIN = 300.0
+
+# Patterns that locate the JWT in the SMN website HTML, in priority order,
+# combined into a single alternation so the page is scanned once. Each
+# alternative captures the token in its own named group.
+_TOKEN_PATTERNS = (
+    # Pattern 1: localStorage.setItem('token', 'eyJ...')
+    r"localStorage\.setItem\(['\"]token['\"]\s*,\s*['\"](?P<p1>[^'\"]+)['\"]",
+    # Pattern 2: localStorage.setItem("token", "eyJ...")
+    r'localStorage\.setItem\("token"\s*,\s*"(?P<p2>[^"]+)"',
+    # Pattern 3: "token":"eyJ..."
+    r'["\']token["\']\s*:\s*["\'](?P<p3>[^"\']+)["\']',
+    # Pattern 4: token = "eyJ..."
+    r'token\s*=\s*["\'](?P<p4>[^"\']+)["\']',
+    # Pattern 5: setItem('token','eyJ...')
+    r"setItem\(['\"]token['\"]\s*,\s*['\"](?P<p5>[^'\"]+)['\"]",
+    # Pattern 6: var/let/const token = "eyJ..."
+    r'(?:var|let|const)\s+token\s*=\s*["\'](?P<p6>[^"\']+)["\']',
+)
+_TOKEN_RE = re.compile("|".join(f"(?:{pattern})" for pattern in _TOKEN_PATTERNS))
+
+# Literal prefixes of the usual localStorage.setItem("token", ...) call, with
+# the quote that closes the token
+_TOKEN_ANCHORS = (
+    ("localStorage.setItem('token', '", "'"),
+    ("localStorage.setItem('token','", "'"),
+    ('localStorage.setItem("token", "', '"'),
+    ('localStorage.setItem("token","', '"'),
+)
+
+
+def _find_token_literal(html: str) -> str | None:
+    """Extract the token after a literal localStorage anchor, without regex."""
+    for anchor, quote in _TOKEN_ANCHORS:
+        if (start := html.find(anchor)) == -1:
+            continue
+        start += len(anchor)
+        if (end := html.find(quote, start)) > start:
+            return html[start:end]
+    return None
+
+
+# Returned by ArgentinaSMNData._async_get_json when the body has not changed
+_UNCHANGED = object()
+
+# Forecast periods and the hour each one starts at: early_morning
+# (00:00-06:00), morning (06:00-12:00), afternoon (12:00-18:00), night (18:00-24:00)
+_FORECAST_PERIODS = (
+    ("early_morning", "00:00"),
+    ("morning", "06:00"),
+    ("afternoon", "12:00"),
+    ("night", "18:00"),
+)
+
+# Per-request limits for every SMN call
+_REQUEST_TIMEOUT = aiohttp.ClientTimeout(
+    total=10, connect=3, sock_connect=3, sock_read=7
+)
+
+# hass.data key of the semaphore capping in-flight SMN requests across all
+# config entries, and how many it lets through
+DATA_BULKHEAD = f"{DOMAIN}_bulkhead"
+_BULKHEAD_SIZE = 4
+
+# Attempts per API request and base delay for exponential backoff
+_MAX_ATTEMPTS = 3
+_RETRY_BACKOFF = 0.5
+
+# Deadline for one endpoint: every attempt running into the request timeout,
+# the longest backoff between them, and one more request's worth of waiting
+# for the bulkhead
+_ENDPOINT_TIMEOUT = (
+    (_MAX_ATTEMPTS + 1) * _REQUEST_TIMEOUT.total
+    + _RETRY_BACKOFF * (2 ** (_MAX_ATTEMPTS - 1) - 1)
+)
+
+
+@callback
+def async_get_bulkhead(hass: HomeAssistant) -> asyncio.Semaphore:
+    """Return the semaphore capping in-flight SMN requests for this instance.
+
+    Created on first use, so it belongs to the running event loop.
+    """
+    if (bulkhead := hass.data.get(DATA_BULKHEAD)) is None:
+        bulkhead = hass.data[DATA_BULKHEAD] = asyncio.Semaphore(_BULKHEAD_SIZE)
+    return bulkhead
+
+
+class CircuitOpenError(aiohttp.ClientConnectionError):
+    """Raised instead of sending a request while its circuit is open."""
+
+
+class CircuitBreaker:
+    """Stop calling a failing endpoint for a while after repeated failures."""
+
+    def __init__(
+        self, failure_threshold: int = 5, recovery_time: float = 60.0
+    ) -> None:
+        """Initialize the circuit breaker."""
+        self._failure_threshold = failure_threshold
+        self._recovery_time = recovery_time
+        self._failures = 0
+        self._opened_at: float | None = None
+
+    @property
+    def is_open(self) -> bool:
+        """Return True while requests should be skipped.
+
+        Once the recovery time has passed a trial request is let through
+        (half-open); another failure re-opens the circuit.
+        """
+        if self._opened_at is None:
+            return False
+        return time.monotonic() - self._opened_at < self._recovery_time
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful request."""
+        self._failures = 0
+        self._opened_at = None
+
+    def record_failure(self) -> None:
+        """Count a failed request, opening the circuit at the threshold."""
+        self._failures += 1
+        if self._failures >= self._failure_threshold:
+            self._opened_at = time.monotonic()
+
+
+def index_reports(
+    reports: Any,
+) -> dict[Any, dict[Any, tuple[str | None, str | None]]]:
+    """Index alert report texts as event id -> level -> (description, instruction).
+
+    Within a report the first matching level wins; a later report for the
+    same event overrides an earlier one.
+    """
+    reports_index: dict[Any, dict[Any, tuple[str | None, str | None]]] = {}
+    if not reports or not isinstance(reports, list):
+        return reports_index
+
+    for report in reports:
+        if not isinstance(report, dict):
+            continue
+        report_levels: dict[Any, tuple[str | None, str | None]] = {}
+        for level_data in report.get("levels", ()):
+            report_levels.setdefault(
+                level_data.get("level"),
+                (level_data.get("description"), level_data.get("instruction")),
+            )
+        reports_index.setdefault(report.get("event_id"), {}).update(report_levels)
+
+    return reports_index
+
 
 class SMNTokenManager:
     """Manage JWT token for SMN API authentication."""
 
-    def __init__(self, session: aiohttp.ClientSession) -> None:
+    __slots__ = (
+        "_session",
+        "_bulkhead",
+        "_token",
+        "_exp_ts",
+        "_headers",
+        "_reauth_lock",
+    )
+
+    def __init__(
+        self, session: aiohttp.ClientSession, bulkhead: asyncio.Semaphore
+    ) -> None:
         """Initialize the token manager."""
         self._session = session
+        self._bulkhead = bulkhead
         self._token: str | None = None
-        self._token_expiration: datetime | None = None
+        # POSIX time after which the token must be refreshed (0.0 = unknown)
+        self._exp_ts: float = 0.0
+        self._headers: dict[str, str] | None = None
+        self._reauth_lock = asyncio.Lock()
 
     def _decode_jwt_payload(self, token: str) -> dict[str, Any]:
         """Decode JWT payload without verification."""
         try:
-            # Split the JWT into parts
-            parts = token.split(".")
-            if len(parts) != 3:
-                raise ValueError("Invalid JWT format")
-
-            # Decode the payload (second part)
-            # Add padding if needed
-            payload = parts[1]
-            padding = 4 - len(payload) % 4
-            if padding != 4:
-                payload += "=" * padding
-
-            decoded = base64.urlsafe_b64decode(payload)
-            return json.loads(decoded)
-        except Exception as err:
+            return jwt.decode(
+                token, options={"verify_signature": False, "verify_exp": False}
+            )
+        except jwt.PyJWTError as err:
             _LOGGER.error("Error decoding JWT: %s", err)
             return {}
 
@@ -68,102 +233,165 @@ class SMNTokenManager:
         """Fetch JWT token from SMN website."""
         try:
             _LOGGER.debug("Fetching JWT token from %s", TOKEN_URL)
-            async with async_timeout.timeout(10):
-                response = await self._session.get(TOKEN_URL)
+            async with self._bulkhead, self._session.get(TOKEN_URL) as response:
                 response.raise_for_status()
                 html = await response.text()
 
-                _LOGGER.debug("Received HTML response, length: %d bytes", len(html))
-
-                # Try multiple patterns to find the token
-                patterns = [
-                    # Pattern 1: localStorage.setItem('token', 'eyJ...')
-                    r"localStorage\.setItem\(['\"]token['\"]\s*,\s*['\"]([^'\"]+)['\"]",
-                    # Pattern 2: localStorage.setItem("token", "eyJ...")
-                    r'localStorage\.setItem\("token"\s*,\s*"([^"]+)"',
-                    # Pattern 3: "token":"eyJ..."
-                    r'["\']token["\']\s*:\s*["\']([^"\']+)["\']',
-                    # Pattern 4: token = "eyJ..."
-                    r'token\s*=\s*["\']([^"\']+)["\']',
-                    # Pattern 5: setItem('token','eyJ...')
-                    r"setItem\(['\"]token['\"]\s*,\s*['\"]([^'\"]+)['\"]",
-                    # Pattern 6: var/let/const token = "eyJ..."
-                    r'(?:var|let|const)\s+token\s*=\s*["\']([^"\']+)["\']',
-                ]
-
-                token = None
-                for i, pattern in enumerate(patterns, 1):
-                    match = re.search(pattern, html)
-                    if match:
-                        token = match.group(1)
-                        _LOGGER.info("Found token using pattern %d (length: %d)", i, len(token))
-                        break
-
-                if not token:
-                    # Log HTML snippet for debugging
-                    lines = html.split('\n')
-                    relevant_lines = [line for line in lines if 'token' in line.lower()]
-                    _LOGGER.error(
-                        "Could not find token in HTML. Lines containing 'token' (%d found):",
-                        len(relevant_lines)
+            _LOGGER.debug("Received HTML response, length: %d bytes", len(html))
+
+            # Look for the usual literal anchors first, then scan for every
+            # pattern at once. The earliest match in the page is not
+            # necessarily the preferred one, so the highest priority pattern
+            # wins, as if each were tried in turn (group names sort in
+            # priority order).
+            if token := _find_token_literal(html):
+                _LOGGER.info("Found token using literal anchor (length: %d)", len(token))
+            else:
+                match = min(
+                    _TOKEN_RE.finditer(html),
+                    key=lambda match: match.lastgroup,
+                    default=None,
+                )
+                if match:
+                    token = match[match.lastgroup]
+                    _LOGGER.info(
+                        "Found token using pattern %s (length: %d)",
+                        match.lastgroup[1:],
+                        len(token),
                     )
-                    for line in relevant_lines[:5]:  # Log first 5 matches
-                        _LOGGER.error("  %s", line.strip()[:200])
 
-                    raise UpdateFailed("Could not find token in HTML. Check logs for details.")
-
-                # Validate token format (JWT should start with eyJ)
-                if not token.startswith('eyJ'):
-                    _LOGGER.warning("Token doesn't look like a JWT (doesn't start with 'eyJ'): %s...", token[:20])
-
-                # Decode token to get expiration
-                payload = self._decode_jwt_payload(token)
-                if "exp" in payload:
-                    self._token_expiration = datetime.fromtimestamp(
-                        payload["exp"], tz=dt_util.UTC
+            if not token:
+                # Log HTML snippet for debugging, stopping at the first 5 matches
+                if _LOGGER.isEnabledFor(logging.ERROR):
+                    relevant_lines = list(
+                        islice(
+                            (
+                                line
+                                for line in html.splitlines()
+                                if "token" in line.lower()
+                            ),
+                            5,
+                        )
                     )
-                    _LOGGER.info(
-                        "Token expires at: %s", self._token_expiration.isoformat()
+                    _LOGGER.error(
+                        "Could not find token in HTML. First lines containing 'token' (%d shown):",
+                        len(relevant_lines)
                     )
-                else:
-                    _LOGGER.warning("Token does not contain expiration field")
+                    for line in relevant_lines:
+                        _LOGGER.error("  %s", line.strip()[:200])
 
-                self._token = token
-                return token
+                raise UpdateFailed("Could not find token in HTML. Check logs for details.")
+
+            # Validate token format (JWT should start with eyJ)
+            if not token.startswith('eyJ'):
+                _LOGGER.warning("Token doesn't look like a JWT (doesn't start with 'eyJ'): %s...", token[:20])
+
+            # Decode token to get expiration
+            payload = self._decode_jwt_payload(token)
+            if "exp" in payload:
+                self._exp_ts = float(payload["exp"]) - _TOKEN_EXPIRY_MARGIN
+                _LOGGER.info(
+                    "Token expires at: %s", self.token_expiration.isoformat()
+                )
+            else:
+                self._exp_ts = 0.0
+                _LOGGER.warning("Token does not contain expiration field")
+
+            self._token = token
+            self._headers = {
+                "Authorization": f"JWT {token}",
+                "Accept": "application/json",
+            }
+            return token
 
         except aiohttp.ClientError as err:
             _LOGGER.error("HTTP error fetching token from %s: %s", TOKEN_URL, err)
             raise UpdateFailed(f"Error fetching token: {err}") from err
-        except Exception as err:
-            _LOGGER.error("Unexpected error fetching token: %s", err, exc_info=True)
-            raise UpdateFailed(f"Unexpected error fetching token: {err}") from err
+        except (TimeoutError, ValueError, TypeError) as err:
+            _LOGGER.error("Timeout or invalid response fetching token: %s", err)
+            raise UpdateFailed(f"Timeout or invalid response fetching token: {err}") from err
 
     async def get_token(self) -> str:
         """Get valid token, refreshing if necessary."""
-        # Check if we have a token and it's still valid
-        if self._token and self._token_expiration:
-            # Refresh if token expires in less than 5 minutes
-            if dt_util.utcnow() < (self._token_expiration - timedelta(minutes=5)):
-                return self._token
+        # Reuse the token until 5 minutes before it expires
+        if self._token and time.time() < self._exp_ts:
+            return self._token
 
         # Fetch new token
         return await self.fetch_token()
 
+    async def get_headers(self) -> dict[str, str]:
+        """Get request headers for the current valid token.
+
+        The returned dict is shared between requests and must not be mutated.
+        """
+        await self.get_token()
+        return self._headers
+
+    async def get_new_headers(self, rejected: dict[str, str]) -> dict[str, str]:
+        """Get request headers for a token other than a rejected one.
+
+        Requests that were rejected together share a single token fetch.
+        """
+        async with self._reauth_lock:
+            if self._headers is None or self._headers.get(
+                "Authorization"
+            ) == rejected.get("Authorization"):
+                await self.fetch_token()
+        return self._headers
+
+    @property
+    def refresh_in(self) -> float | None:
+        """Return seconds until the token should be refreshed, if known."""
+        if not self._exp_ts:
+            return None
+        return self._exp_ts - time.time()
+
     @property
     def token_expiration(self) -> datetime | None:
         """Return token expiration time."""
-        return self._token_expiration
+        if not self._exp_ts:
+            return None
+        return datetime.fromtimestamp(
+            self._exp_ts + _TOKEN_EXPIRY_MARGIN, tz=dt_util.UTC
+        )
 
 
 class ArgentinaSMNData:
     """Class to handle SMN data."""
 
+    __slots__ = (
+        "_hass",
+        "_latitude",
+        "_longitude",
+        "_location_id",
+        "_weather_url",
+        "_forecast_url",
+        "_alert_url",
+        "_shortterm_alert_url",
+        "_session",
+        "_bulkhead",
+        "_token_manager",
+        "current_weather_data",
+        "daily_forecast",
+        "hourly_forecast",
+        "alerts",
+        "shortterm_alerts",
+        "heat_warnings",
+        "alerts_required",
+        "_etags",
+        "_response_crcs",
+        "_breakers",
+        "_area_id",
+    )
+
     def __init__(
         self,
         hass: HomeAssistant,
         latitude: float,
         longitude: float,
         token_manager: SMNTokenManager,
+        session: aiohttp.ClientSession,
         location_id: str | None = None,
     ) -> None:
         """Initialize the data object."""
@@ -171,7 +399,10 @@ class ArgentinaSMNData:
         self._latitude = latitude
         self._longitude = longitude
         self._location_id = location_id
-        self._session = async_get_clientsession(hass)
+        if location_id:
+            self._set_location_urls(location_id)
+        self._session = session
+        self._bulkhead = async_get_bulkhead(hass)
         self._token_manager = token_manager
 
         self.current_weather_data: dict[str, Any] = {}
@@ -181,32 +412,140 @@ class ArgentinaSMNData:
         self.shortterm_alerts: list[dict[str, Any]] = []
         self.heat_warnings: dict[str, Any] = {}
 
+        # Whether anything consumes alerts; when False the alert and heat
+        # warning requests are skipped
+        self.alerts_required: bool = True
+
+        # ETag and CRC32 of the last response body per endpoint, to skip
+        # downloading or re-parsing unchanged data
+        self._etags: dict[str, str] = {}
+        self._response_crcs: dict[str, int] = {}
+
+        # Circuit breaker per endpoint
+        self._breakers: dict[str, CircuitBreaker] = {}
+
+        # Warning area of the location, learned from the alerts response
+        self._area_id: str | None = None
+
     async def _get_headers(self) -> dict[str, str]:
         """Get headers with authentication token."""
         try:
-            token = await self._token_manager.get_token()
-            _LOGGER.debug("Using token for API request (first 20 chars): %s...", token[:20])
-            return {
-                "Authorization": f"JWT {token}",
-                "Accept": "application/json",
-            }
-        except Exception as err:
+            return await self._token_manager.get_headers()
+        except UpdateFailed as err:
             _LOGGER.error("Failed to get authentication token: %s", err)
             raise
 
+    async def _async_request(
+        self, key: str, url: str, headers: dict[str, str]
+    ) -> aiohttp.ClientResponse:
+        """GET an endpoint, retrying server and connection errors with backoff.
+
+        A 401 is retried once with a freshly fetched token. The returned
+        response is already read and released to the pool.
+        """
+        if (breaker := self._breakers.get(key)) is None:
+            breaker = self._breakers[key] = CircuitBreaker()
+        if breaker.is_open:
+            raise CircuitOpenError(f"Circuit open for {key}, skipping request")
+
+        attempt = 0
+        reauthenticated = False
+        while True:
+            try:
+                async with self._bulkhead, self._session.get(
+                    url, headers=headers
+                ) as response:
+                    response.raise_for_status()
+                    # Read the body while the connection is held; read()
+                    # returns it again once the connection is released
+                    await response.read()
+            except aiohttp.ClientResponseError as err:
+                # The token may have been revoked before its expiry
+                if err.status == 401 and not reauthenticated:
+                    _LOGGER.debug("Token rejected for %s, fetching a new one", key)
+                    reauthenticated = True
+                    headers = {
+                        **headers,
+                        **await self._token_manager.get_new_headers(headers),
+                    }
+                    continue
+                # Other client errors will not go away by retrying
+                if err.status < 500:
+                    raise
+                failure = err
+            except (aiohttp.ClientError, TimeoutError) as err:
+                failure = err
+            else:
+                breaker.record_success()
+                return response
+
+            attempt += 1
+            if attempt == _MAX_ATTEMPTS:
+                breaker.record_failure()
+                raise failure
+
+            # Exponential backoff with full jitter
+            delay = random.uniform(0, _RETRY_BACKOFF * 2 ** (attempt - 1))
+            _LOGGER.debug(
+                "Request for %s failed (%s), retrying in %.2f seconds", key, failure, delay
+            )
+            await asyncio.sleep(delay)
+
+    async def _async_get_json(
+        self, key: str, url: str, headers: dict[str, str]
+    ) -> Any:
+        """Fetch and decode JSON, or return _UNCHANGED if the body is unchanged.
+
+        Callers must forget the response if parsing the returned data fails,
+        otherwise the same body would be skipped as unchanged on the next poll.
+        """
+        if etag := self._etags.get(key):
+            headers = {**headers, "If-None-Match": etag}
+
+        # A slow endpoint times out on its own and leaves the others be
+        async with asyncio.timeout(_ENDPOINT_TIMEOUT):
+            response = await self._async_request(key, url, headers)
+        if response.status == 304:
+            return _UNCHANGED
+
+        raw = await response.read()
+        crc = zlib.crc32(raw)
+        if self._response_crcs.get(key) != crc:
+            data = json_loads(raw)
+            self._response_crcs[key] = crc
+        else:
+            data = _UNCHANGED
+
+        # Only remember the ETag once the body it belongs to has been decoded
+        if etag := response.headers.get("ETag"):
+            self._etags[key] = etag
+        return data
+
+    def _forget_response(self, key: str) -> None:
+        """Drop the cached ETag and crc so the next response is parsed again."""
+        self._etags.pop(key, None)
+        self._response_crcs.pop(key, None)
+
+    def _set_location_urls(self, location_id: str) -> None:
+        """Build the per-location endpoint URLs once the location is known."""
+        self._weather_url = f"{API_WEATHER_ENDPOINT}/{location_id}"
+        self._forecast_url = f"{API_FORECAST_ENDPOINT}/{location_id}"
+        self._alert_url = f"{API_ALERT_ENDPOINT}/{location_id}"
+        self._shortterm_alert_url = f"{API_SHORTTERM_ALERT_ENDPOINT}/{location_id}"
+
     async def _get_location_id(self) -> str:
         """Get the location ID from coordinates."""
         if self._location_id:
             return self._location_id
 
-        url = f"{API_COORD_ENDPOINT}?lat={self._latitude}&lon={self._longitude}"
+        params = {"lat": self._latitude, "lon": self._longitude}
         headers = await self._get_headers()
 
         try:
-            _LOGGER.debug("Fetching location ID from: %s", url)
-            async with async_timeout.timeout(10):
-                response = await self._session.get(url, headers=headers)
-
+            _LOGGER.debug("Fetching location ID from: %s %s", API_COORD_ENDPOINT, params)
+            async with self._bulkhead, self._session.get(
+                API_COORD_ENDPOINT, params=params, headers=headers
+            ) as response:
                 if response.status == 401:
                     response_text = await response.text()
                     _LOGGER.error(
@@ -215,28 +554,29 @@ class ArgentinaSMNData:
                     )
 
                 response.raise_for_status()
-                data = await response.json()
+                data = json_loads(await response.read())
 
-                _LOGGER.debug("Location API response: %s", data)
+            _LOGGER.debug("Location API response: %s", data)
 
-                # Extract location ID from response
-                # The actual key might differ - adjust based on API response
-                if isinstance(data, dict):
-                    self._location_id = str(data.get("id") or data.get("location_id"))
-                elif isinstance(data, list) and len(data) > 0:
-                    self._location_id = str(data[0].get("id") or data[0].get("location_id"))
-                else:
-                    raise UpdateFailed(f"Unexpected response format: {data}")
+            # Extract location ID from response
+            # The actual key might differ - adjust based on API response
+            if isinstance(data, dict):
+                self._location_id = str(data.get("id") or data.get("location_id"))
+            elif isinstance(data, list) and len(data) > 0:
+                self._location_id = str(data[0].get("id") or data[0].get("location_id"))
+            else:
+                raise UpdateFailed(f"Unexpected response format: {data}")
 
-                _LOGGER.info("Location ID for %s,%s: %s", self._latitude, self._longitude, self._location_id)
-                return self._location_id
+            _LOGGER.info("Location ID for %s,%s: %s", self._latitude, self._longitude, self._location_id)
+            self._set_location_urls(self._location_id)
+            return self._location_id
 
         except aiohttp.ClientError as err:
             _LOGGER.error("HTTP error fetching location ID: %s", err)
             raise UpdateFailed(f"Error fetching location ID: {err}") from err
-        except Exception as err:
-            _LOGGER.error("Unexpected error fetching location ID: %s", err, exc_info=True)
-            raise UpdateFailed(f"Unexpected error fetching location ID: {err}") from err
+        except (TimeoutError, ValueError) as err:
+            _LOGGER.error("Timeout or invalid response fetching location ID: %s", err)
+            raise UpdateFailed(f"Timeout or invalid response fetching location ID: {err}") from err
 
     async def fetch_data(self) -> None:
         """Fetch data from SMN API."""
@@ -244,237 +584,294 @@ class ArgentinaSMNData:
             # Get location ID if not already set
             location_id = await self._get_location_id()
 
-            # Fetch current weather
-            await self._fetch_current_weather(location_id)
-
-            # Fetch forecast data
-            await self._fetch_forecast(location_id)
-
-            # Fetch alerts
-            await self._fetch_alerts(location_id)
-
-            # Fetch short-term alerts
-            await self._fetch_shortterm_alerts(location_id)
-
-        except Exception as err:
+            # One token check covers every request in this update
+            headers = await self._get_headers()
+
+            # The endpoints are independent once the location is known, so
+            # fetch them concurrently
+            fetches = [
+                self._fetch_current_weather(location_id, headers),
+                self._fetch_forecast(location_id, headers),
+                self._fetch_shortterm_alerts(location_id, headers),
+            ]
+            # Heat warnings need the alerts' area_id; once it is known they
+            # are fetched alongside the alerts
+            area_id = self._area_id
+            if self.alerts_required:
+                fetches.append(self._fetch_alerts(location_id, headers))
+                if area_id:
+                    fetches.append(self._fetch_heat_warnings(area_id, headers))
+            else:
+                self.alerts = {}
+                self.heat_warnings = {}
+                self._forget_response("alerts")
+                self._forget_response("heat_warnings")
+
+            # Let every request finish before surfacing an unexpected error
+            results = await asyncio.gather(*fetches, return_exceptions=True)
+            errors = [result for result in results if isinstance(result, Exception)]
+            for error in errors:
+                _LOGGER.debug("Error during SMN update: %s", error)
+            if errors:
+                raise errors[0]
+
+            # Fetch heat warnings for a newly learned or changed area_id
+            if (
+                self.alerts_required
+                and (new_area_id := self.alerts.get("area_id"))
+                and new_area_id != area_id
+            ):
+                self._area_id = new_area_id
+                self._forget_response("heat_warnings")
+                await self._fetch_heat_warnings(new_area_id, headers)
+
+        except (aiohttp.ClientError, ValueError) as err:
             raise UpdateFailed(f"Error fetching SMN data: {err}") from err
 
-    async def _fetch_current_weather(self, location_id: str) -> None:
+    async def _fetch_current_weather(
+        self, location_id: str, headers: dict[str, str]
+    ) -> None:
         """Fetch current weather data."""
-        url = f"{API_WEATHER_ENDPOINT}/{location_id}"
-        headers = await self._get_headers()
+        url = self._weather_url
 
         try:
             _LOGGER.debug("Fetching current weather from: %s", url)
-            async with async_timeout.timeout(10):
-                response = await self._session.get(url, headers=headers)
-                response.raise_for_status()
-                data = await response.json()
-
-                _LOGGER.debug("Current weather response: %s", data)
-
-                # Parse current weather data
-                if isinstance(data, dict):
-                    # Extract wind data
-                    wind_data = data.get("wind", {})
-                    location_data = data.get("location", {})
-
-                    self.current_weather_data = {
-                        "temperature": data.get("temperature"),
-                        "feels_like": data.get("feels_like"),
-                        "humidity": data.get("humidity"),
-                        "pressure": data.get("pressure"),
-                        "visibility": data.get("visibility"),
-                        "wind_speed": wind_data.get("speed") if isinstance(wind_data, dict) else None,
-                        "wind_deg": wind_data.get("deg") if isinstance(wind_data, dict) else None,
-                        "weather": data.get("weather"),
-                        "name": location_data.get("name") if isinstance(location_data, dict) else None,
-                    }
-                    _LOGGER.info("Updated current weather data for location %s: temp=%s, feels_like=%s",
-                                location_id,
-                                self.current_weather_data.get("temperature"),
-                                self.current_weather_data.get("feels_like"))
+            data = await self._async_get_json("current_weather", url, headers)
+            if data is _UNCHANGED:
+                _LOGGER.debug("Current weather for location %s unchanged", location_id)
+                return
+
+            _LOGGER.debug("Current weather response: %s", data)
+
+            # Parse current weather data
+            if isinstance(data, dict):
+                # Extract wind data
+                wind_data = data.get("wind", {})
+                location_data = data.get("location", {})
+
+                self.current_weather_data = {
+                    "temperature": data.get("temperature"),
+                    "feels_like": data.get("feels_like"),
+                    "humidity": data.get("humidity"),
+                    "pressure": data.get("pressure"),
+                    "visibility": data.get("visibility"),
+                    "wind_speed": wind_data.get("speed") if isinstance(wind_data, dict) else None,
+                    "wind_deg": wind_data.get("deg") if isinstance(wind_data, dict) else None,
+                    "weather": data.get("weather"),
+                    "name": location_data.get("name") if isinstance(location_data, dict) else None,
+                }
+                _LOGGER.info("Updated current weather data for location %s: temp=%s, feels_like=%s",
+                            location_id,
+                            self.current_weather_data.get("temperature"),
+                            self.current_weather_data.get("feels_like"))
 
         except aiohttp.ClientError as err:
             _LOGGER.error("Error fetching current weather: %s", err)
-        except Exception as err:
-            _LOGGER.error("Unexpected error fetching current weather: %s", err)
-
-    async def _fetch_forecast(self, location_id: str) -> None:
+        except (TimeoutError, ValueError) as err:
+            _LOGGER.error("Timeout or invalid response fetching current weather: %s", err)
+            self._forget_response("current_weather")
+        except (KeyError, TypeError, AttributeError) as err:
+            _LOGGER.error("Unexpected current weather payload: %s", err)
+            self._forget_response("current_weather")
+
+    async def _fetch_forecast(
+        self, location_id: str, headers: dict[str, str]
+    ) -> None:
         """Fetch forecast data."""
-        url = f"{API_FORECAST_ENDPOINT}/{location_id}"
-        headers = await self._get_headers()
+        url = self._forecast_url
 
         try:
             _LOGGER.debug("Fetching forecast from: %s", url)
-            async with async_timeout.timeout(10):
-                response = await self._session.get(url, headers=headers)
-                response.raise_for_status()
-                data = await response.json()
-
-                _LOGGER.debug("Forecast response: %s", data)
-
-                # Parse forecast data structure
-                # Response has a "forecast" array with daily data
-                # Each day has: date, temp_max, temp_min, early_morning, morning, afternoon, night
-                forecast_data = data.get("forecast", []) if isinstance(data, dict) else data
-
-                if isinstance(forecast_data, list):
-                    # Store daily forecast data
-                    self.daily_forecast = []
-                    self.hourly_forecast = []
-
-                    for day in forecast_data:
-                        # Get representative weather condition from afternoon period
-                        afternoon = day.get("afternoon", {})
-                        weather_obj = afternoon.get("weather") if isinstance(afternoon, dict) else None
-
-                        _LOGGER.info(
-                            "Parsing daily forecast for %s: afternoon=%s, weather_obj=%s",
-                            day.get("date"),
-                            type(afternoon).__name__,
-                            weather_obj
-                        )
+            data = await self._async_get_json("forecast", url, headers)
+            if data is _UNCHANGED:
+                _LOGGER.debug("Forecast for location %s unchanged", location_id)
+                return
+
+            _LOGGER.debug("Forecast response: %s", data)
+
+            # Parse forecast data structure
+            # Response has a "forecast" array with daily data
+            # Each day has: date, temp_max, temp_min, early_morning, morning, afternoon, night
+            forecast_data = data.get("forecast", []) if isinstance(data, dict) else data
+
+            if isinstance(forecast_data, list):
+                daily_forecast = []
+                hourly_forecast = []
+                daily_append = daily_forecast.append
+                hourly_append = hourly_forecast.append
+
+                for day in forecast_data:
+                    date = day.get("date")
+
+                    # Get representative weather condition from afternoon period
+                    afternoon = day.get("afternoon", {})
+                    weather_obj = afternoon.get("weather") if isinstance(afternoon, dict) else None
+
+                    _LOGGER.debug(
+                        "Parsing daily forecast for %s: afternoon=%s, weather_obj=%s",
+                        date,
+                        type(afternoon).__name__,
+                        weather_obj
+                    )
 
-                        # Create daily forecast entry - store full weather object to preserve ID
-                        daily_entry = {
-                            "date": day.get("date"),
+                    # Create daily forecast entry - store full weather object to preserve ID
+                    daily_append(
+                        {
+                            "date": date,
                             "temp_max": day.get("temp_max"),
                             "temp_min": day.get("temp_min"),
                             "weather": weather_obj,  # Store full object with id and description
                         }
-                        self.daily_forecast.append(daily_entry)
-
-                        # Create hourly forecasts from time periods
-                        # early_morning (00:00-06:00), morning (06:00-12:00),
-                        # afternoon (12:00-18:00), night (18:00-24:00)
-                        periods = [
-                            ("early_morning", "00:00"),
-                            ("morning", "06:00"),
-                            ("afternoon", "12:00"),
-                            ("night", "18:00"),
-                        ]
-
-                        for period_name, period_time in periods:
-                            period_data = day.get(period_name)
-                            if period_data and isinstance(period_data, dict):
-                                # Extract wind data
-                                wind_data = period_data.get("wind", {})
-                                # Use average of speed_range if available, otherwise single speed
-                                speed_range = wind_data.get("speed_range", []) if isinstance(wind_data, dict) else []
-                                wind_speed = sum(speed_range) / len(speed_range) if speed_range else wind_data.get("speed") if isinstance(wind_data, dict) else None
-
-                                # Store full weather object to preserve ID
-                                weather_obj = period_data.get("weather")
-
-                                _LOGGER.info(
-                                    "Parsing hourly forecast for %s %s: weather_obj=%s",
-                                    day.get("date"),
-                                    period_name,
-                                    weather_obj
-                                )
-
-                                hourly_entry = {
-                                    "date": day.get("date"),
-                                    "time": period_time,
-                                    "datetime": f"{day.get('date')}T{period_time}:00",
-                                    "temperature": period_data.get("temperature"),
-                                    "weather": weather_obj,  # Store full object with id and description
-                                    "humidity": period_data.get("humidity"),
-                                    "wind_speed": wind_speed,
-                                    "wind_direction": wind_data.get("deg") if isinstance(wind_data, dict) else None,
-                                }
-                                self.hourly_forecast.append(hourly_entry)
-
-                    _LOGGER.info(
-                        "Parsed %d daily forecasts and %d hourly forecasts",
-                        len(self.daily_forecast),
-                        len(self.hourly_forecast),
                     )
 
+                    # Create hourly forecasts from time periods
+                    for period_name, period_time in _FORECAST_PERIODS:
+                        period_data = day.get(period_name)
+                        if not period_data or not isinstance(period_data, dict):
+                            continue
+
+                        # Extract wind data
+                        wind_data = period_data.get("wind", {})
+                        if isinstance(wind_data, dict):
+                            # Use average of speed_range if available, otherwise single speed
+                            speed_range = wind_data.get("speed_range")
+                            wind_speed = (
+                                sum(speed_range) / len(speed_range)
+                                if speed_range
+                                else wind_data.get("speed")
+                            )
+                            wind_direction = wind_data.get("deg")
+                        else:
+                            wind_speed = wind_direction = None
+
+                        # Store full weather object to preserve ID
+                        weather_obj = period_data.get("weather")
+
+                        _LOGGER.debug(
+                            "Parsing hourly forecast for %s %s: weather_obj=%s",
+                            date,
+                            period_name,
+                            weather_obj
+                        )
+
+                        hourly_append(
+                            {
+                                "date": date,
+                                "time": period_time,
+                                "datetime": f"{date}T{period_time}:00",
+                                "temperature": period_data.get("temperature"),
+                                "weather": weather_obj,  # Store full object with id and description
+                                "humidity": period_data.get("humidity"),
+                                "wind_speed": wind_speed,
+                                "wind_direction": wind_direction,
+                            }
+                        )
+
+                self.daily_forecast = daily_forecast
+                self.hourly_forecast = hourly_forecast
+
+                _LOGGER.info(
+                    "Parsed %d daily forecasts and %d hourly forecasts",
+                    len(self.daily_forecast),
+                    len(self.hourly_forecast),
+                )
+
         except aiohttp.ClientError as err:
             _LOGGER.error("Error fetching forecast: %s", err)
-        except Exception as err:
-            _LOGGER.error("Unexpected error fetching forecast: %s", err)
-
-    async def _fetch_alerts(self, location_id: str) -> None:
+        except (TimeoutError, ValueError) as err:
+            _LOGGER.error("Timeout or invalid response fetching forecast: %s", err)
+            self._forget_response("forecast")
+        except (KeyError, TypeError, AttributeError) as err:
+            _LOGGER.error("Unexpected forecast payload: %s", err)
+            self._forget_response("forecast")
+
+    async def _fetch_alerts(
+        self, location_id: str, headers: dict[str, str]
+    ) -> None:
         """Fetch weather alerts."""
-        url = f"{API_ALERT_ENDPOINT}/{location_id}"
-        headers = await self._get_headers()
+        url = self._alert_url
 
         try:
-            async with async_timeout.timeout(10):
-                response = await self._session.get(url, headers=headers)
-                response.raise_for_status()
-                data = await response.json()
-
-                # Store full alerts data (dict with warnings, reports, area_id)
-                if isinstance(data, dict):
-                    self.alerts = data
-                    _LOGGER.info("Fetched alerts for location %s: %d warnings",
-                                location_id, len(data.get("warnings", [])))
-
-                    # Get area_id for heat warnings if available
-                    area_id = data.get("area_id")
-                    if area_id:
-                        await self._fetch_heat_warnings(area_id)
-                else:
-                    self.alerts = {}
+            data = await self._async_get_json("alerts", url, headers)
+
+            # Store full alerts data (dict with warnings, reports, area_id)
+            if data is _UNCHANGED:
+                _LOGGER.debug("Alerts for location %s unchanged", location_id)
+            elif isinstance(data, dict):
+                self.alerts = data
+                _LOGGER.info("Fetched alerts for location %s: %d warnings",
+                            location_id, len(data.get("warnings", [])))
+            else:
+                self.alerts = {}
 
         except aiohttp.ClientError as err:
             _LOGGER.debug("Error fetching alerts (may be normal if none): %s", err)
-        except Exception as err:
-            _LOGGER.debug("Unexpected error fetching alerts: %s", err)
-
-    async def _fetch_shortterm_alerts(self, location_id: str) -> None:
+        except (TimeoutError, ValueError) as err:
+            _LOGGER.debug("Timeout or invalid response fetching alerts: %s", err)
+            self._forget_response("alerts")
+        except (KeyError, TypeError, AttributeError) as err:
+            _LOGGER.debug("Unexpected alerts payload: %s", err)
+            self._forget_response("alerts")
+
+    async def _fetch_shortterm_alerts(
+        self, location_id: str, headers: dict[str, str]
+    ) -> None:
         """Fetch short-term severe weather alerts."""
-        url = f"{API_SHORTTERM_ALERT_ENDPOINT}/{location_id}"
-        headers = await self._get_headers()
+        url = self._shortterm_alert_url
 
         try:
-            async with async_timeout.timeout(10):
-                response = await self._session.get(url, headers=headers)
-                response.raise_for_status()
-                data = await response.json()
-
-                # Store short-term alerts data (list of alerts)
-                if isinstance(data, list):
-                    self.shortterm_alerts = data
-                    _LOGGER.info("Fetched %d short-term alerts for location %s",
-                                len(data), location_id)
-                else:
-                    self.shortterm_alerts = []
+            data = await self._async_get_json("shortterm_alerts", url, headers)
+
+            # Store short-term alerts data (list of alerts)
+            if data is _UNCHANGED:
+                _LOGGER.debug("Short-term alerts for location %s unchanged", location_id)
+            elif isinstance(data, list):
+                self.shortterm_alerts = data
+                _LOGGER.info("Fetched %d short-term alerts for location %s",
+                            len(data), location_id)
+            else:
+                self.shortterm_alerts = []
 
         except aiohttp.ClientError as err:
             _LOGGER.debug("Error fetching short-term alerts (may be normal if none): %s", err)
             self.shortterm_alerts = []
-        except Exception as err:
-            _LOGGER.debug("Unexpected error fetching short-term alerts: %s", err)
+            self._forget_response("shortterm_alerts")
+        except (TimeoutError, ValueError) as err:
+            _LOGGER.debug("Timeout or invalid response fetching short-term alerts: %s", err)
+            self.shortterm_alerts = []
+            self._forget_response("shortterm_alerts")
+        except (KeyError, TypeError, AttributeError) as err:
+            _LOGGER.debug("Unexpected short-term alerts payload: %s", err)
             self.shortterm_alerts = []
+            self._forget_response("shortterm_alerts")
 
-    async def _fetch_heat_warnings(self, area_id: str) -> None:
+    async def _fetch_heat_warnings(
+        self, area_id: str, headers: dict[str, str]
+    ) -> None:
         """Fetch heat warnings."""
         url = f"{API_HEAT_WARNING_ENDPOINT}/{area_id}"
-        headers = await self._get_headers()
 
         try:
-            async with async_timeout.timeout(10):
-                response = await self._session.get(url, headers=headers)
-                response.raise_for_status()
-                data = await response.json()
-
-                # Store heat warning data as dict
-                if isinstance(data, dict):
-                    self.heat_warnings = data
-                    _LOGGER.info("Fetched heat warning for area %s: level=%s",
-                                area_id, data.get("level"))
-                else:
-                    self.heat_warnings = {}
+            data = await self._async_get_json("heat_warnings", url, headers)
+
+            # Store heat warning data as dict
+            if data is _UNCHANGED:
+                _LOGGER.debug("Heat warning for area %s unchanged", area_id)
+            elif isinstance(data, dict):
+                self.heat_warnings = data
+                _LOGGER.info("Fetched heat warning for area %s: level=%s",
+                            area_id, data.get("level"))
+            else:
+                self.heat_warnings = {}
 
         except aiohttp.ClientError as err:
             _LOGGER.debug("Error fetching heat warnings (may be normal if none): %s", err)
-        except Exception as err:
-            _LOGGER.debug("Unexpected error fetching heat warnings: %s", err)
+        except (TimeoutError, ValueError) as err:
+            _LOGGER.debug("Timeout or invalid response fetching heat warnings: %s", err)
+            self._forget_response("heat_warnings")
+        except (KeyError, TypeError, AttributeError) as err:
+            _LOGGER.debug("Unexpected heat warnings payload: %s", err)
+            self._forget_response("heat_warnings")
 
 
 class ArgentinaSMNDataUpdateCoordinator(DataUpdateCoordinator[ArgentinaSMNData]):
@@ -486,75 +883,141 @@ class ArgentinaSMNDataUpdateCoordinator(DataUpdateCoordinator[ArgentinaSMNData])
         config_entry: ConfigEntry,
     ) -> None:
         """Initialize the coordinator."""
-        self._token_refresh_unsub = None
+        self._token_refresh_task: asyncio.Task[None] | None = None
+        self._config_entry_id = config_entry.entry_id
+        # Set once the alert services are used, so alerts keep being fetched
+        self.alerts_requested = False
+        self._reports_index_source: dict[str, Any] | None = None
+        self._reports_index: dict[Any, dict[Any, tuple[str | None, str | None]]] = {}
 
         # Get coordinates from config entry
         latitude = config_entry.data[CONF_LATITUDE]
         longitude = config_entry.data[CONF_LONGITUDE]
 
+        # One dedicated session for the token page and the SMN API, so both
+        # share its connection pool; closed when the entry unloads
+        session = async_create_clientsession(hass, timeout=_REQUEST_TIMEOUT)
+
         # Create token manager
-        session = async_get_clientsession(hass)
-        self._token_manager = SMNTokenManager(session)
+        self._token_manager = SMNTokenManager(session, async_get_bulkhead(hass))
+
+        # Reuse the location ID resolved on a previous start for these coordinates
+        location_id = None
+        if config_entry.data.get(CONF_CACHED_COORDS) == [latitude, longitude]:
+            location_id = config_entry.data.get(CONF_CACHED_LOCATION_ID)
 
         # Store data handler before calling super().__init__
-        self._smn_data = ArgentinaSMNData(hass, latitude, longitude, self._token_manager)
+        self._smn_data = ArgentinaSMNData(
+            hass, latitude, longitude, self._token_manager, session, location_id
+        )
 
         super().__init__(
             hass,
             _LOGGER,
             name=DOMAIN,
             update_interval=timedelta(seconds=DEFAULT_SCAN_INTERVAL),
+            # Coalesce bursts of refresh requests into a single update
+            request_refresh_debouncer=Debouncer(
+                hass, _LOGGER, cooldown=REQUEST_REFRESH_COOLDOWN, immediate=False
+            ),
         )
 
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the HTTP session used for SMN API requests."""
+        return self._smn_data._session
+
+    def _alerts_required(self) -> bool:
+        """Return True if the alert services or any enabled entity use alerts."""
+        if self.alerts_requested:
+            return True
+
+        entries = er.async_entries_for_config_entry(
+            er.async_get(self.hass), self._config_entry_id
+        )
+        # Entities are not registered yet on first setup
+        if not entries:
+            return True
+
+        # Everything except the short-term alert sensor reads the alerts data;
+        # the weather entity exposes the alerts and heat warnings as attributes
+        shortterm_unique_id = f"{self._config_entry_id}_shortterm_alert"
+        return any(
+            not entry.disabled and entry.unique_id != shortterm_unique_id
+            for entry in entries
+        )
+
+    @property
+    def reports_index(self) -> dict[Any, dict[Any, tuple[str | None, str | None]]]:
+        """Return alert report texts indexed by event id and level.
+
+        Rebuilt only when the alerts data object changes, so all alert
+        entities share a single index per update.
+        """
+        alerts = self.data.alerts
+        if alerts is not self._reports_index_source:
+            self._reports_index = index_reports(
+                alerts.get("reports") if isinstance(alerts, dict) else None
+            )
+            self._reports_index_source = alerts
+        return self._reports_index
+
+    async def async_shutdown(self) -> None:
+        """Cancel the token refresh task and close the API session."""
+        await super().async_shutdown()
+        if self._token_refresh_task:
+            self._token_refresh_task.cancel()
+            self._token_refresh_task = None
+        await self.session.close()
+
     async def _async_update_data(self) -> ArgentinaSMNData:
         """Fetch data from API."""
+        self._smn_data.alerts_required = self._alerts_required()
         await self._smn_data.fetch_data()
+        self._async_cache_location_id()
 
-        # Schedule token refresh if needed
-        self._schedule_token_refresh()
+        # Keep the token fresh in the background, off the update path
+        if self._token_refresh_task is None or self._token_refresh_task.done():
+            self._token_refresh_task = self.hass.async_create_background_task(
+                self._async_token_refresh_loop(), f"{DOMAIN} token refresh"
+            )
 
         return self._smn_data
 
-    def _schedule_token_refresh(self) -> None:
-        """Schedule token refresh before expiration."""
-        # Cancel existing refresh if any
-        if self._token_refresh_unsub:
-            self._token_refresh_unsub()
-            self._token_refresh_unsub = None
-
-        # Get token expiration
-        expiration = self._token_manager.token_expiration
-        if not expiration:
+    @callback
+    def _async_cache_location_id(self) -> None:
+        """Persist the resolved location ID so restarts skip the lookup."""
+        location_id = self._smn_data._location_id
+        entry = self.hass.config_entries.async_get_entry(self._config_entry_id)
+        if entry is None or entry.data.get(CONF_CACHED_LOCATION_ID) == location_id:
             return
 
-        # Schedule refresh 5 minutes before expiration
-        now = dt_util.utcnow()
-        refresh_time = expiration - timedelta(minutes=5)
-
-        if refresh_time <= now:
-            # Token expires very soon, will be refreshed on next data fetch
-            return
-
-        # Calculate seconds until refresh
-        seconds_until_refresh = (refresh_time - now).total_seconds()
-
-        _LOGGER.debug(
-            "Scheduling token refresh in %.0f seconds (at %s)",
-            seconds_until_refresh,
-            refresh_time.isoformat(),
+        self.hass.config_entries.async_update_entry(
+            entry,
+            data={
+                **entry.data,
+                CONF_CACHED_LOCATION_ID: location_id,
+                CONF_CACHED_COORDS: [
+                    self._smn_data._latitude,
+                    self._smn_data._longitude,
+                ],
+            },
         )
 
-        async def _refresh_token(now):
-            """Refresh token callback."""
+    async def _async_token_refresh_loop(self) -> None:
+        """Refresh the token 5 minutes before it expires, until it fails.
+
+        fetch_token swaps the token, expiry and headers without awaiting in
+        between, so concurrent get_token callers see either the old or the
+        new token. The loop ends when the expiry is unknown or a refresh
+        fails; the next update restarts it and get_token covers the gap.
+        """
+        while (delay := self._token_manager.refresh_in) is not None and delay > 0:
+            _LOGGER.debug("Scheduling token refresh in %.0f seconds", delay)
+            await asyncio.sleep(delay)
             try:
                 await self._token_manager.fetch_token()
-                _LOGGER.info("Token refreshed successfully")
-                # Schedule next refresh
-                self._schedule_token_refresh()
-            except Exception as err:
+            except UpdateFailed as err:
                 _LOGGER.error("Failed to refresh token: %s", err)
-
-        self._token_refresh_unsub = async_call_later(
-            self.hass, seconds_until_refresh, _refresh_token
-        )
-
+                return
+            _LOGGER.info("Token refreshed successfully")
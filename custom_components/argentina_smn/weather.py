@@ -2,7 +2,9 @@
 from __future__ import annotations
 
 from datetime import datetime
+from functools import lru_cache
 import logging
+import time
 from typing import Any
 
 from homeassistant.components.weather import (
@@ -35,6 +37,12 @@ from .coordinator import ArgentinaSMNDataUpdateCoordinator
 
 _LOGGER = logging.getLogger(__name__)
 
+# Seconds a sun up/down check is reused for the current condition
+_SUN_UP_TTL = 60.0
+
+# Current weather key for visibility, resolved once
+_VISIBILITY_KEY = ATTR_MAP.get("visibility", "visibility")
+
 
 def format_condition(condition: dict | None, sun_is_up: bool = True) -> str:
     """Map SMN weather condition ID to HA condition.
@@ -69,6 +77,40 @@ def format_condition(condition: dict | None, sun_is_up: bool = True) -> str:
     return ha_condition
 
 
+@lru_cache(maxsize=512)
+def _parse_datetime(date_str: str | None) -> str | None:
+    """Parse datetime string to ISO format.
+
+    Forecast items share dates heavily, so results are cached.
+    """
+    if not date_str:
+        return None
+
+    # SMN sends ISO 8601, which the C parser handles directly (including "Z"
+    # and date-only values, which become midnight)
+    try:
+        return datetime.fromisoformat(date_str).isoformat()
+    except (ValueError, TypeError):
+        pass
+
+    try:
+        # Try parsing as ISO format
+        dt = dt_util.parse_datetime(date_str)
+        if dt:
+            return dt.isoformat()
+
+        # Try parsing as date only
+        date_obj = dt_util.parse_date(date_str)
+        if date_obj:
+            return datetime.combine(
+                date_obj, datetime.min.time()
+            ).isoformat()
+
+        return date_str
+    except (ValueError, TypeError):
+        return date_str
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -106,6 +148,10 @@ class ArgentinaSMNWeather(
         self._config_entry = config_entry
         self._attr_name = config_entry.data.get("name", "SMN Weather")
         self._attr_unique_id = f"{config_entry.entry_id}"
+        # Formatted forecasts per type, with the coordinator list they came from
+        self._forecast_cache: dict[bool, tuple[list[dict[str, Any]], list[Forecast]]] = {}
+        # Monotonic time of the last sun check and its result
+        self._sun_up: tuple[float, bool] | None = None
 
     @property
     def device_info(self) -> DeviceInfo:
@@ -129,9 +175,12 @@ class ArgentinaSMNWeather(
             or self.coordinator.data.current_weather_data.get("weather")
         )
 
-        # Check if sun is up for proper day/night condition
-        sun_up = is_up(self.hass)
-        return format_condition(condition, sun_up)
+        # Check if sun is up for proper day/night condition; the state is read
+        # often, so the sun position is only recomputed once a minute
+        now = time.monotonic()
+        if self._sun_up is None or now - self._sun_up[0] >= _SUN_UP_TTL:
+            self._sun_up = (now, is_up(self.hass))
+        return format_condition(condition, self._sun_up[1])
 
     @property
     def native_temperature(self) -> float | None:
@@ -166,9 +215,7 @@ class ArgentinaSMNWeather(
     @property
     def native_visibility(self) -> float | None:
         """Return the visibility."""
-        return self.coordinator.data.current_weather_data.get(
-            ATTR_MAP.get("visibility", "visibility")
-        )
+        return self.coordinator.data.current_weather_data.get(_VISIBILITY_KEY)
 
     def _format_forecast(
         self, forecast_data: list[dict[str, Any]], is_daily: bool = False
@@ -177,69 +224,58 @@ class ArgentinaSMNWeather(
         if not forecast_data:
             return []
 
-        forecasts: list[Forecast] = []
-
-        for item in forecast_data:
-            # Skip if missing required fields
-            if not item.get("date") and not item.get("datetime"):
-                continue
-
-            if is_daily:
-                # Daily forecast has temp_max and temp_min
-                weather_obj = item.get("weather")
-                _LOGGER.info("Daily forecast for %s - weather: %s", item.get("date"), weather_obj)
-                forecast = Forecast(
-                    datetime=self._parse_datetime(item.get("date")),
-                    native_temperature=item.get("temp_max"),
-                    native_templow=item.get("temp_min"),
-                    condition=format_condition(weather_obj),
-                )
-            else:
-                # Hourly forecast has individual period data
-                weather_obj = item.get("weather")
-                _LOGGER.info("Hourly forecast for %s - weather: %s", item.get("datetime"), weather_obj)
-                forecast = Forecast(
-                    datetime=self._parse_datetime(item.get("datetime")),
-                    native_temperature=item.get("temperature"),
-                    condition=format_condition(weather_obj),
-                    humidity=item.get("humidity"),
-                    native_wind_speed=item.get("wind_speed"),
-                    wind_bearing=item.get("wind_direction"),
+        # Items without a date or datetime are skipped; ``get`` is bound once
+        # per item by the filter and reused for every field
+        if is_daily:
+            # Daily forecast has temp_max and temp_min
+            return [
+                Forecast(
+                    datetime=_parse_datetime(get("date")),
+                    native_temperature=get("temp_max"),
+                    native_templow=get("temp_min"),
+                    condition=format_condition(get("weather")),
                 )
+                for item in forecast_data
+                if (get := item.get)("date") or get("datetime")
+            ]
+
+        # Hourly forecast has individual period data
+        return [
+            Forecast(
+                datetime=_parse_datetime(get("datetime")),
+                native_temperature=get("temperature"),
+                condition=format_condition(get("weather")),
+                humidity=get("humidity"),
+                native_wind_speed=get("wind_speed"),
+                wind_bearing=get("wind_direction"),
+            )
+            for item in forecast_data
+            if (get := item.get)("date") or get("datetime")
+        ]
+
+    def _cached_forecast(
+        self, forecast_data: list[dict[str, Any]], is_daily: bool
+    ) -> list[Forecast]:
+        """Return formatted forecasts, reused until the coordinator replaces the list.
 
-            forecasts.append(forecast)
+        The coordinator assigns new forecast lists when the forecast changes,
+        so the identity of the source list tells whether the cache is stale.
+        """
+        cached = self._forecast_cache.get(is_daily)
+        if cached is not None and cached[0] is forecast_data:
+            return cached[1]
 
+        forecasts = self._format_forecast(forecast_data, is_daily=is_daily)
+        self._forecast_cache[is_daily] = (forecast_data, forecasts)
         return forecasts
 
-    def _parse_datetime(self, date_str: str | None) -> str | None:
-        """Parse datetime string to ISO format."""
-        if not date_str:
-            return None
-
-        try:
-            # Try parsing as ISO format
-            dt = dt_util.parse_datetime(date_str)
-            if dt:
-                return dt.isoformat()
-
-            # Try parsing as date only
-            date_obj = dt_util.parse_date(date_str)
-            if date_obj:
-                return datetime.combine(
-                    date_obj, datetime.min.time()
-                ).isoformat()
-
-            return date_str
-        except (ValueError, TypeError):
-            return date_str
-
     async def async_forecast_daily(self) -> list[Forecast] | None:
         """Return the daily forecast."""
-        return self._format_forecast(self.coordinator.data.daily_forecast, is_daily=True)
+        return self._cached_forecast(self.coordinator.data.daily_forecast, is_daily=True)
 
     async def async_forecast_hourly(self) -> list[Forecast] | None:
         """Return the hourly forecast."""
-        return self._format_forecast(self.coordinator.data.hourly_forecast, is_daily=False)
+        return self._cached_forecast(self.coordinator.data.hourly_forecast, is_daily=False)
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
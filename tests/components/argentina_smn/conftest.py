@@ -1,465 +1,181 @@
 """Fixtures for SMN integration tests."""
-from collections.abc import Generator
-from unittest.mock import AsyncMock, MagicMock, patch
+from __future__ import annotations
 
+from collections.abc import Callable
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+from unittest.mock import AsyncMock, MagicMock
+
+import jwt
 import pytest
 
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.util.json import JsonValueType, json_loads
+
+from custom_components.argentina_smn import coordinator
+from custom_components.argentina_smn.const import DOMAIN
+
+_FIXTURES_DIR = Path(__file__).parent / "fixtures"
+
+# Mock JWT token, encoded once; exp is far in the future for expiration testing
+_JWT_PAYLOAD = {"sub": "1234567890", "name": "Test User", "exp": 9999999999}
+_JWT = jwt.encode(_JWT_PAYLOAD, "test-secret", algorithm="HS256")
+
+
+async def _async_noop(*args: Any, **kwargs: Any) -> None:
+    """Stand in for a coroutine method whose calls are not asserted on."""
+
+
+@lru_cache(maxsize=None)
+def _load_fixture_bytes(filename: str) -> bytes:
+    """Read a raw payload from the fixtures directory once."""
+    return (_FIXTURES_DIR / filename).read_bytes()
+
+
+@lru_cache(maxsize=None)
+def _load_fixture(filename: str) -> JsonValueType:
+    """Load and parse a JSON payload from the fixtures directory once."""
+    return json_loads(_load_fixture_bytes(filename))
+
+
+@pytest.fixture(scope="session")
+def fixture_bytes() -> Callable[[str], bytes]:
+    """Return a loader for raw fixture payloads, to serve as HTTP bodies."""
+    return _load_fixture_bytes
+
 
 @pytest.fixture
+def mock_config_entry() -> ConfigEntry:
+    """Return a mock config entry."""
+    return ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Ciudad de Buenos Aires",
+        data={
+            CONF_LATITUDE: -34.6217,
+            CONF_LONGITUDE: -58.4258,
+            "name": "Ciudad de Buenos Aires",
+        },
+        source="user",
+        unique_id="4864",
+    )
+
+
+@pytest.fixture(scope="session")
 def mock_jwt_token() -> str:
     """Return a mock JWT token."""
-    # Mock JWT token (header.payload.signature format)
-    # Payload includes exp field for expiration testing
-    return "eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJzdWIiOiIxMjM0NTY3ODkwIiwibmFtZSI6IlRlc3QgVXNlciIsImV4cCI6OTk5OTk5OTk5OX0.signature"
+    return _JWT
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
+def mock_jwt_payload() -> dict[str, Any]:
+    """Return the claims encoded in the mock JWT token."""
+    return _JWT_PAYLOAD
+
+
+@pytest.fixture(scope="session")
 def mock_location_data() -> dict:
     """Return mock location data from georef API."""
-    return {
-        "id": "4864",
-        "name": "Ciudad de Buenos Aires",
-        "department": "Comuna 1",
-        "province": "Ciudad Autónoma de Buenos Aires",
-        "coord": {"lat": -34.6217, "lon": -58.4258},
-    }
+    return _load_fixture("location.json")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_current_weather() -> dict:
     """Return mock current weather data."""
-    return {
-        "temperature": 22.5,
-        "feels_like": 21.0,
-        "humidity": 65,
-        "pressure": 1013.2,
-        "visibility": 10000,
-        "weather": {"id": 3, "description": "Despejado"},
-        "wind": {"speed": 15.5, "deg": 180},
-        "location": {
-            "id": "4864",
-            "name": "Ciudad de Buenos Aires",
-            "province": "Ciudad Autónoma de Buenos Aires",
-        },
-    }
+    return _load_fixture("current_weather.json")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_forecast_data() -> dict:
     """Return mock forecast data."""
-    return {
-        "updated": "2025-12-30T17:32:59-03:00",
-        "location": {
-            "id": 4864,
-            "name": "Ciudad Autónoma de Buenos Aires",
-            "department": "CABA",
-            "province": "CABA",
-            "type": "Ciudad",
-            "coord": {"lon": -58.4258, "lat": -34.6217}
-        },
-        "type": "location",
-        "forecast": [
-            {
-                "date": "2025-12-30",
-                "temp_min": None,
-                "temp_max": None,
-                "humidity_min": None,
-                "humidity_max": None,
-                "early_morning": None,
-                "morning": None,
-                "afternoon": None,
-                "night": {
-                    "humidity": 30.0,
-                    "rain_prob_range": [0, 0],
-                    "gust_range": None,
-                    "temperature": 31.0,
-                    "visibility": "Buena",
-                    "rain06h": 0.0,
-                    "weather": {"description": "Parcialmente nublado", "id": 25},
-                    "wind": {
-                        "direction": "NO",
-                        "deg": 315.0,
-                        "speed_range": [13, 22]
-                    },
-                    "river": None,
-                    "border": None
-                }
-            },
-            {
-                "date": "2025-12-31",
-                "temp_min": 27.0,
-                "temp_max": 39.0,
-                "humidity_min": 31.0,
-                "humidity_max": 39.0,
-                "early_morning": {
-                    "humidity": 35.0,
-                    "rain_prob_range": [0, 0],
-                    "gust_range": [42, 50],
-                    "temperature": 27.0,
-                    "visibility": "Buena",
-                    "rain06h": 0.0,
-                    "weather": {"description": "Algo nublado", "id": 19},
-                    "wind": {
-                        "direction": "NO",
-                        "deg": 315.0,
-                        "speed_range": [23, 31]
-                    },
-                    "river": None,
-                    "border": None
-                },
-                "morning": {
-                    "humidity": 39.0,
-                    "rain_prob_range": [0, 0],
-                    "gust_range": None,
-                    "temperature": 31.0,
-                    "visibility": "Buena",
-                    "rain06h": 0.0,
-                    "weather": {"description": "Ligeramente nublado", "id": 13},
-                    "wind": {
-                        "direction": "O",
-                        "deg": 292.5,
-                        "speed_range": [13, 22]
-                    },
-                    "river": None,
-                    "border": None
-                },
-                "afternoon": {
-                    "humidity": 31.0,
-                    "rain_prob_range": [10, 40],
-                    "gust_range": None,
-                    "temperature": 39.0,
-                    "visibility": "Regular",
-                    "rain06h": 0.0,
-                    "weather": {"description": "Chaparrones", "id": 74},
-                    "wind": {
-                        "direction": "O",
-                        "deg": 292.5,
-                        "speed_range": [13, 22]
-                    },
-                    "river": None,
-                    "border": None
-                },
-                "night": {
-                    "humidity": 36.0,
-                    "rain_prob_range": [0, 10],
-                    "gust_range": None,
-                    "temperature": 33.0,
-                    "visibility": "Buena",
-                    "rain06h": 0.0,
-                    "weather": {"description": "Parcialmente nublado", "id": 25},
-                    "wind": {
-                        "direction": "NO",
-                        "deg": 315.0,
-                        "speed_range": [13, 22]
-                    },
-                    "river": None,
-                    "border": None
-                }
-            },
-            {
-                "date": "2026-01-01",
-                "temp_min": 21.0,
-                "temp_max": 30.0,
-                "humidity_min": 43.0,
-                "humidity_max": 66.0,
-                "early_morning": {
-                    "humidity": 59.0,
-                    "rain_prob_range": [0, 0],
-                    "gust_range": None,
-                    "temperature": 21.0,
-                    "visibility": "Buena",
-                    "rain06h": 0.0,
-                    "weather": {"description": "Parcialmente nublado", "id": 25},
-                    "wind": {
-                        "direction": "SE",
-                        "deg": 135.0,
-                        "speed_range": [13, 22]
-                    },
-                    "river": None,
-                    "border": None
-                },
-                "morning": {
-                    "humidity": 56.0,
-                    "rain_prob_range": [0, 0],
-                    "gust_range": [42, 50],
-                    "temperature": 24.0,
-                    "visibility": "Buena",
-                    "rain06h": 0.0,
-                    "weather": {"description": "Mayormente nublado", "id": 37},
-                    "wind": {
-                        "direction": "SE",
-                        "deg": 135.0,
-                        "speed_range": [23, 31]
-                    },
-                    "river": None,
-                    "border": None
-                },
-                "afternoon": {
-                    "humidity": 43.0,
-                    "rain_prob_range": [0, 0],
-                    "gust_range": None,
-                    "temperature": 30.0,
-                    "visibility": "Buena",
-                    "rain06h": 0.1,
-                    "weather": {"description": "Parcialmente nublado", "id": 25},
-                    "wind": {
-                        "direction": "NE",
-                        "deg": 67.5,
-                        "speed_range": [13, 22]
-                    },
-                    "river": None,
-                    "border": None
-                },
-                "night": {
-                    "humidity": 66.0,
-                    "rain_prob_range": [0, 0],
-                    "gust_range": None,
-                    "temperature": 24.0,
-                    "visibility": "Buena",
-                    "rain06h": 0.0,
-                    "weather": {"description": "Parcialmente nublado", "id": 25},
-                    "wind": {
-                        "direction": "E",
-                        "deg": 90.0,
-                        "speed_range": [13, 22]
-                    },
-                    "river": None,
-                    "border": None
-                }
-            }
-        ]
-    }
+    return _load_fixture("forecast.json")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_alerts_data() -> dict:
     """Return mock alerts data with no active alerts (all level 1)."""
-    return {
-        "area_id": 762,
-        "updated": "2025-12-30T17:33:07-03:00",
-        "warnings": [
-            {
-                "date": "2025-12-30",
-                "max_level": 1,
-                "events": [
-                    {
-                        "id": 37,
-                        "max_level": 1,
-                        "levels": {
-                            "early_morning": None,
-                            "morning": None,
-                            "afternoon": None,
-                            "night": 1
-                        }
-                    },
-                    {
-                        "id": 54,
-                        "max_level": 1,
-                        "levels": {
-                            "early_morning": None,
-                            "morning": None,
-                            "afternoon": None,
-                            "night": 1
-                        }
-                    },
-                    {
-                        "id": 39,
-                        "max_level": 1,
-                        "levels": {
-                            "early_morning": None,
-                            "morning": None,
-                            "afternoon": None,
-                            "night": 1
-                        }
-                    },
-                    {
-                        "id": 40,
-                        "max_level": 1,
-                        "levels": {
-                            "early_morning": None,
-                            "morning": None,
-                            "afternoon": None,
-                            "night": 1
-                        }
-                    },
-                    {
-                        "id": 41,
-                        "max_level": 1,
-                        "levels": {
-                            "early_morning": None,
-                            "morning": None,
-                            "afternoon": None,
-                            "night": 1
-                        }
-                    },
-                    {
-                        "id": 42,
-                        "max_level": 1,
-                        "levels": {
-                            "early_morning": None,
-                            "morning": None,
-                            "afternoon": None,
-                            "night": 1
-                        }
-                    }
-                ]
-            }
-        ],
-        "reports": []
-    }
+    return _load_fixture("alerts.json")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_alerts_data_with_active() -> dict:
     """Return mock alerts data with active alerts (for testing alert sensors)."""
-    return {
-        "area_id": 762,
-        "updated": "2025-12-30T17:33:07-03:00",
-        "warnings": [
-            {
-                "date": "2025-12-30",
-                "max_level": 3,
-                "events": [
-                    {
-                        "id": 41,  # tormenta
-                        "max_level": 3,
-                        "levels": {
-                            "early_morning": None,
-                            "morning": None,
-                            "afternoon": None,
-                            "night": 3
-                        }
-                    },
-                    {
-                        "id": 37,  # lluvia
-                        "max_level": 2,
-                        "levels": {
-                            "early_morning": None,
-                            "morning": None,
-                            "afternoon": None,
-                            "night": 2
-                        }
-                    }
-                ]
-            }
-        ],
-        "reports": [
-            {
-                "event_id": 41,
-                "levels": [
-                    {
-                        "level": 3,
-                        "description": "Tormentas fuertes",
-                        "instruction": "Manténgase informado"
-                    }
-                ]
-            },
-            {
-                "event_id": 37,
-                "levels": [
-                    {
-                        "level": 2,
-                        "description": "Lluvias moderadas",
-                        "instruction": "Esté atento"
-                    }
-                ]
-            }
-        ]
-    }
+    return _load_fixture("alerts_active.json")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def mock_shortterm_alerts() -> list:
     """Return mock short-term alerts data."""
-    return [
-        {
-            "id": 30060,
-            "title": "TORMENTAS FUERTES CON RAFAGAS Y OCASIONAL CAIDA DE GRANIZO. ",
-            "date": "2025-12-30T19:42:00-03:00",
-            "end_date": "2025-12-30T20:42:00-03:00",
-            "zones": [
-                "BUENOS AIRES: Ayacucho - Balcarce - Mar Chiquita."
-            ],
-            "severity": "N",
-            "geometry": {
-                "type": "Polygon",
-                "coordinates": [
-                    [
-                        [-58.76, -37.23],
-                        [-58.2, -37.61],
-                        [-57.8, -37.3],
-                        [-58.24, -36.95]
-                    ]
-                ]
-            },
-            "images": [
-                {
-                    "title": "gmp_general",
-                    "url": "http://estaticos.smn.gob.ar/pronosticos/avisomet/datos_aviso/HkuFGi0TlWNom4e/avi_gral.gif"
-                }
-            ],
-            "region": "Sector Centro",
-            "partial": "Y",
-            "provinces": [
-                {
-                    "id": 6,
-                    "name": "Buenos Aires",
-                    "locations": [4268, 4289, 4290, 4293]
-                }
-            ],
-            "instructions": "1- Retirá o asegurá objetos que puedan ser arrastrados por el viento.\n2- Cerrá y alejate de puertas y ventanas.\n3- No te refugies debajo de marquesinas, carteles publicitarios, árboles o postes.\n4- Permanecé en construcciones cerradas como casas, escuelas o edificios públicos.\n5- Mantenete alejado de artefactos eléctricos y evitá el uso de teléfonos con cable.\n6- Si estás al aire libre, buscá refugio inmediato en un edificio, casa o vehículo cerrado.\n7- Para minimizar el riesgo de ser alcanzado por un rayo, no permanezcas en playas, ríos, lagunas o piletas."
-        }
-    ]
+    return _load_fixture("shortterm_alerts.json")
 
 
 @pytest.fixture
-def mock_token_manager() -> Generator[MagicMock, None, None]:
+def mock_token_manager(monkeypatch: pytest.MonkeyPatch) -> MagicMock:
     """Mock the SMN token manager."""
-    with patch(
-        "custom_components.argentina_smn.coordinator.SMNTokenManager"
-    ) as mock_manager:
-        manager_instance = mock_manager.return_value
-        manager_instance.get_token = AsyncMock(
-            return_value="eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJleHAiOjk5OTk5OTk5OTl9.sig"
-        )
-        manager_instance.fetch_token = AsyncMock(
-            return_value="eyJhbGciOiJIUzI1NiIsInR5cCI6IkpXVCJ9.eyJleHAiOjk5OTk5OTk5OTl9.sig"
-        )
-        yield manager_instance
+    mock_manager = MagicMock()
+    monkeypatch.setattr(coordinator, "SMNTokenManager", mock_manager)
+    manager_instance = mock_manager.return_value
+    manager_instance.get_token = AsyncMock(return_value=_JWT)
+    manager_instance.fetch_token = AsyncMock(return_value=_JWT)
+    manager_instance.get_headers = AsyncMock(
+        return_value={"Authorization": f"JWT {_JWT}", "Accept": "application/json"}
+    )
+    # Expiry unknown, so the coordinator does not schedule a token refresh
+    manager_instance.refresh_in = None
+    return manager_instance
 
 
 @pytest.fixture
-def mock_aiohttp_session() -> Generator[MagicMock, None, None]:
-    """Mock aiohttp session for API calls."""
-    with patch("aiohttp.ClientSession") as mock_session:
-        session_instance = MagicMock()
-        mock_session.return_value = session_instance
-
-        # Mock response
-        mock_response = AsyncMock()
-        mock_response.raise_for_status = MagicMock()
-        mock_response.json = AsyncMock()
-
-        # Setup context manager
-        mock_get = AsyncMock()
-        mock_get.__aenter__ = AsyncMock(return_value=mock_response)
-        mock_get.__aexit__ = AsyncMock()
-
-        session_instance.get = MagicMock(return_value=mock_get)
-
-        yield session_instance
+def mock_smn_data(
+    monkeypatch: pytest.MonkeyPatch,
+    mock_token_manager: MagicMock,
+    mock_current_weather: dict,
+) -> MagicMock:
+    """Mock the SMN data object with current weather and no forecast or alerts.
+
+    Tests override individual attributes before setting up the entry.
+    """
+    mock_data = MagicMock()
+    monkeypatch.setattr(coordinator, "ArgentinaSMNData", mock_data)
+    data_instance = mock_data.return_value
+    data_instance.current_weather_data = mock_current_weather
+    data_instance.daily_forecast = []
+    data_instance.hourly_forecast = []
+    data_instance.alerts = {}
+    data_instance.shortterm_alerts = []
+    data_instance.heat_warnings = {}
+    data_instance.fetch_data = _async_noop
+    # Real values for what the coordinator persists to the config entry
+    data_instance._location_id = "4864"
+    data_instance._latitude = -34.6217
+    data_instance._longitude = -58.4258
+    data_instance._session.close = AsyncMock()
+    return data_instance
 
 
 @pytest.fixture
 def mock_coordinator_data(
-    mock_current_weather, mock_forecast_data, mock_alerts_data, mock_shortterm_alerts
-) -> dict:
-    """Return mock coordinator data."""
-    return {
-        "current_weather_data": mock_current_weather,
-        "daily_forecast": mock_forecast_data.get("forecast", []),
-        "hourly_forecast": [],
-        "alerts": mock_alerts_data,
-        "shortterm_alerts": mock_shortterm_alerts,
-        "heat_warnings": {},
-    }
+    request: pytest.FixtureRequest,
+) -> Callable[..., dict[str, Any]]:
+    """Return a factory for mock coordinator data.
+
+    The payload fixtures are only resolved when the factory is called, and
+    keyword arguments replace individual keys.
+    """
+
+    def _build(**overrides: Any) -> dict[str, Any]:
+        get = request.getfixturevalue
+        return {
+            "current_weather_data": get("mock_current_weather"),
+            "daily_forecast": get("mock_forecast_data")["forecast"],
+            "hourly_forecast": [],
+            "alerts": get("mock_alerts_data"),
+            "shortterm_alerts": get("mock_shortterm_alerts"),
+            "heat_warnings": {},
+            **overrides,
+        }
+
+    return _build
@@ -1,17 +1,15 @@
 """Test the SMN config flow."""
 from unittest.mock import AsyncMock, patch
 
-import pytest
-
 from homeassistant import config_entries
 from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
 from homeassistant.core import HomeAssistant
 from homeassistant.data_entry_flow import FlowResultType
 
+from custom_components.argentina_smn.config_flow import ArgentinaSMNConfigFlow
 from custom_components.argentina_smn.const import DOMAIN
 
 
-@pytest.mark.asyncio
 async def test_form_home_location(
     hass: HomeAssistant, mock_token_manager, mock_location_data
 ) -> None:
@@ -57,7 +55,6 @@ async def test_form_home_location(
         }
 
 
-@pytest.mark.asyncio
 async def test_form_custom_location(
     hass: HomeAssistant, mock_token_manager, mock_location_data
 ) -> None:
@@ -97,7 +94,6 @@ async def test_form_custom_location(
         assert "name" in result2["data"]
 
 
-@pytest.mark.asyncio
 async def test_form_already_configured(
     hass: HomeAssistant, mock_token_manager, mock_location_data
 ) -> None:
@@ -147,7 +143,33 @@ async def test_form_already_configured(
         assert result2["reason"] == "already_configured"
 
 
-@pytest.mark.asyncio
+async def test_check_unique_id_tolerance(hass: HomeAssistant) -> None:
+    """Test nearby coordinates match even when they round differently."""
+    existing_entry = config_entries.ConfigEntry(
+        version=1,
+        minor_version=1,
+        domain=DOMAIN,
+        title="Buenos Aires",
+        data={
+            CONF_LATITUDE: -34.60004,
+            CONF_LONGITUDE: -58.4258,
+            "name": "Buenos Aires",
+        },
+        source=config_entries.SOURCE_USER,
+        options={},
+        unique_id="buenos_aires",
+    )
+    existing_entry.add_to_hass(hass)
+
+    flow = ArgentinaSMNConfigFlow()
+    flow.hass = hass
+    flow.handler = DOMAIN
+
+    # -34.60004 and -34.60006 round to different 4 decimal values
+    assert flow._async_check_unique_id(-34.60006, -58.4258) == (False, "Buenos Aires")
+    assert flow._async_check_unique_id(-34.6002, -58.4258) == (True, None)
+
+
 async def test_form_api_error(hass: HomeAssistant, mock_token_manager) -> None:
     """Test we handle API errors."""
     result = await hass.config_entries.flow.async_init(
@@ -0,0 +1,397 @@
+"""Test the SMN data fetching against mocked HTTP responses."""
+from collections.abc import Awaitable, Callable
+from http import HTTPStatus
+from typing import Any
+
+import aiohttp
+import jwt
+import pytest
+from yarl import URL
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.aiohttp_client import async_create_clientsession
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.test_util.aiohttp import (
+    AiohttpClientMocker,
+    AiohttpClientMockResponse,
+)
+
+from custom_components.argentina_smn import coordinator
+
+from custom_components.argentina_smn.const import (
+    API_ALERT_ENDPOINT,
+    API_COORD_ENDPOINT,
+    API_FORECAST_ENDPOINT,
+    API_HEAT_WARNING_ENDPOINT,
+    API_SHORTTERM_ALERT_ENDPOINT,
+    API_WEATHER_ENDPOINT,
+    CONF_CACHED_COORDS,
+    CONF_CACHED_LOCATION_ID,
+    TOKEN_URL,
+)
+from custom_components.argentina_smn.coordinator import (
+    _MAX_ATTEMPTS,
+    ArgentinaSMNData,
+    ArgentinaSMNDataUpdateCoordinator,
+    CircuitOpenError,
+    SMNTokenManager,
+    _find_token_literal,
+    async_get_bulkhead,
+)
+
+WEATHER_URL = f"{API_WEATHER_ENDPOINT}/4864"
+FORECAST_URL = f"{API_FORECAST_ENDPOINT}/4864"
+
+
+def _responses(
+    url: str, *statuses: HTTPStatus
+) -> Callable[..., Awaitable[AiohttpClientMockResponse]]:
+    """Return a side effect answering successive requests with the given statuses."""
+    responses = iter(statuses)
+
+    async def side_effect(method: str, *args: Any) -> AiohttpClientMockResponse:
+        return AiohttpClientMockResponse(method, URL(url), status=next(responses))
+
+    return side_effect
+
+
+@pytest.fixture
+async def smn_data(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    monkeypatch: pytest.MonkeyPatch,
+) -> ArgentinaSMNData:
+    """Return SMN data for a resolved location, retrying without backoff."""
+    monkeypatch.setattr(coordinator, "_RETRY_BACKOFF", 0)
+    session = async_create_clientsession(hass)
+    return ArgentinaSMNData(
+        hass,
+        -34.6217,
+        -58.4258,
+        SMNTokenManager(session, async_get_bulkhead(hass)),
+        session,
+        "4864",
+    )
+
+
+async def test_fetch_data(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    mock_jwt_token,
+    mock_jwt_payload,
+    fixture_bytes,
+    mock_forecast_data,
+    mock_alerts_data,
+    mock_shortterm_alerts,
+) -> None:
+    """Test a full update from the token page through every endpoint."""
+    aioclient_mock.get(
+        TOKEN_URL,
+        text=f"<script>localStorage.setItem('token', '{mock_jwt_token}');</script>",
+    )
+    # Serve the fixture files as-is rather than re-encoding the parsed payloads
+    aioclient_mock.get(API_COORD_ENDPOINT, content=fixture_bytes("location.json"))
+    aioclient_mock.get(
+        f"{API_WEATHER_ENDPOINT}/4864", content=fixture_bytes("current_weather.json")
+    )
+    aioclient_mock.get(
+        f"{API_FORECAST_ENDPOINT}/4864", content=fixture_bytes("forecast.json")
+    )
+    aioclient_mock.get(
+        f"{API_ALERT_ENDPOINT}/4864", content=fixture_bytes("alerts.json")
+    )
+    aioclient_mock.get(
+        f"{API_SHORTTERM_ALERT_ENDPOINT}/4864",
+        content=fixture_bytes("shortterm_alerts.json"),
+    )
+    aioclient_mock.get(
+        f"{API_HEAT_WARNING_ENDPOINT}/762", json={"area_id": 762, "level": 1}
+    )
+
+    session = async_create_clientsession(hass)
+    token_manager = SMNTokenManager(session, async_get_bulkhead(hass))
+    data = ArgentinaSMNData(hass, -34.6217, -58.4258, token_manager, session)
+
+    await data.fetch_data()
+
+    assert await token_manager.get_headers() == {
+        "Authorization": f"JWT {mock_jwt_token}",
+        "Accept": "application/json",
+    }
+    assert token_manager.token_expiration == dt_util.utc_from_timestamp(
+        mock_jwt_payload["exp"]
+    )
+    assert data.current_weather_data["temperature"] == 22.5
+    assert data.current_weather_data["wind_speed"] == 15.5
+    assert data.current_weather_data["name"] == "Ciudad de Buenos Aires"
+    assert len(data.daily_forecast) == len(mock_forecast_data["forecast"])
+    assert data.hourly_forecast
+    assert data.alerts == mock_alerts_data
+    assert data.shortterm_alerts == mock_shortterm_alerts
+    assert data.heat_warnings == {"area_id": 762, "level": 1}
+    # Token page, location lookup, four location endpoints and heat warnings
+    assert aioclient_mock.call_count == 7
+
+
+async def test_request_retries_server_errors(
+    aioclient_mock: AiohttpClientMocker, smn_data: ArgentinaSMNData
+) -> None:
+    """Test a server error is retried until a request succeeds."""
+    aioclient_mock.get(
+        WEATHER_URL,
+        side_effect=_responses(
+            WEATHER_URL, HTTPStatus.BAD_GATEWAY, HTTPStatus.BAD_GATEWAY, HTTPStatus.OK
+        ),
+    )
+
+    response = await smn_data._async_request("current_weather", WEATHER_URL, {})
+
+    assert response.status == HTTPStatus.OK
+    assert aioclient_mock.call_count == _MAX_ATTEMPTS
+
+
+async def test_circuit_breaker(
+    aioclient_mock: AiohttpClientMocker, smn_data: ArgentinaSMNData
+) -> None:
+    """Test the circuit opens after repeated failures and recovers half-open."""
+    aioclient_mock.get(WEATHER_URL, status=HTTPStatus.INTERNAL_SERVER_ERROR)
+
+    # Each failed call counts once, after all of its attempts
+    for _ in range(5):
+        with pytest.raises(aiohttp.ClientResponseError):
+            await smn_data._async_request("current_weather", WEATHER_URL, {})
+    assert aioclient_mock.call_count == 5 * _MAX_ATTEMPTS
+
+    # While open, requests fail fast without reaching the API
+    with pytest.raises(CircuitOpenError):
+        await smn_data._async_request("current_weather", WEATHER_URL, {})
+    assert aioclient_mock.call_count == 5 * _MAX_ATTEMPTS
+
+    # Once the recovery time has passed a failed trial re-opens the circuit
+    breaker = smn_data._breakers["current_weather"]
+    breaker._opened_at -= breaker._recovery_time
+    with pytest.raises(aiohttp.ClientResponseError):
+        await smn_data._async_request("current_weather", WEATHER_URL, {})
+    with pytest.raises(CircuitOpenError):
+        await smn_data._async_request("current_weather", WEATHER_URL, {})
+
+    # A successful trial closes it again
+    breaker._opened_at -= breaker._recovery_time
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(WEATHER_URL, json={})
+    await smn_data._async_request("current_weather", WEATHER_URL, {})
+    assert not breaker.is_open
+    await smn_data._async_request("current_weather", WEATHER_URL, {})
+    assert aioclient_mock.call_count == 2
+
+
+async def test_request_reauthenticates_once(
+    aioclient_mock: AiohttpClientMocker,
+    smn_data: ArgentinaSMNData,
+    mock_jwt_token,
+    mock_jwt_payload,
+) -> None:
+    """Test a 401 fetches one new token and retries with it."""
+    new_token = jwt.encode(
+        {**mock_jwt_payload, "jti": "renewed"}, "test-secret", algorithm="HS256"
+    )
+    tokens = iter((mock_jwt_token, new_token))
+
+    async def token_page(method: str, *args: Any) -> AiohttpClientMockResponse:
+        return AiohttpClientMockResponse(
+            method,
+            URL(TOKEN_URL),
+            text=f"<script>localStorage.setItem('token', '{next(tokens)}');</script>",
+        )
+
+    aioclient_mock.get(TOKEN_URL, side_effect=token_page)
+    aioclient_mock.get(
+        WEATHER_URL,
+        side_effect=_responses(WEATHER_URL, HTTPStatus.UNAUTHORIZED, HTTPStatus.OK),
+    )
+
+    headers = await smn_data._token_manager.get_headers()
+    response = await smn_data._async_request("current_weather", WEATHER_URL, headers)
+
+    assert response.status == HTTPStatus.OK
+    calls = [(str(url), headers) for _, url, _, headers in aioclient_mock.mock_calls]
+    assert [url for url, _ in calls] == [TOKEN_URL, WEATHER_URL, TOKEN_URL, WEATHER_URL]
+    assert calls[1][1]["Authorization"] == f"JWT {mock_jwt_token}"
+    assert calls[3][1]["Authorization"] == f"JWT {new_token}"
+
+
+async def test_unchanged_body_is_not_reparsed(
+    aioclient_mock: AiohttpClientMocker, smn_data: ArgentinaSMNData, fixture_bytes
+) -> None:
+    """Test a repeated response body keeps the previously parsed forecast."""
+    aioclient_mock.get(FORECAST_URL, content=fixture_bytes("forecast.json"))
+
+    await smn_data._fetch_forecast("4864", {})
+    daily_forecast = smn_data.daily_forecast
+    await smn_data._fetch_forecast("4864", {})
+
+    assert aioclient_mock.call_count == 2
+    assert smn_data.daily_forecast is daily_forecast
+
+
+async def test_malformed_forecast_keeps_data(
+    aioclient_mock: AiohttpClientMocker, smn_data: ArgentinaSMNData, fixture_bytes
+) -> None:
+    """Test an unexpected forecast payload keeps the previously parsed forecast."""
+    aioclient_mock.get(FORECAST_URL, content=fixture_bytes("forecast.json"))
+    await smn_data._fetch_forecast("4864", {})
+    daily_forecast = smn_data.daily_forecast
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(FORECAST_URL, json={"forecast": [1]})
+    await smn_data._fetch_forecast("4864", {})
+
+    assert smn_data.daily_forecast is daily_forecast
+
+
+async def test_malformed_body_is_reparsed(
+    aioclient_mock: AiohttpClientMocker,
+    smn_data: ArgentinaSMNData,
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    """Test a body that failed to parse is not skipped as unchanged next time."""
+    aioclient_mock.get(
+        FORECAST_URL, json={"forecast": [1]}, headers={"ETag": '"forecast-1"'}
+    )
+
+    await smn_data._fetch_forecast("4864", {})
+    await smn_data._fetch_forecast("4864", {})
+
+    assert "If-None-Match" not in aioclient_mock.mock_calls[1][3]
+    assert caplog.text.count("Unexpected forecast payload") == 2
+
+
+async def test_not_modified_keeps_data(
+    aioclient_mock: AiohttpClientMocker, smn_data: ArgentinaSMNData, fixture_bytes
+) -> None:
+    """Test the ETag is sent back and a 304 keeps the parsed forecast."""
+    aioclient_mock.get(
+        FORECAST_URL,
+        content=fixture_bytes("forecast.json"),
+        headers={"ETag": '"forecast-1"'},
+    )
+    await smn_data._fetch_forecast("4864", {})
+    daily_forecast = smn_data.daily_forecast
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(FORECAST_URL, status=HTTPStatus.NOT_MODIFIED)
+    await smn_data._fetch_forecast("4864", {})
+
+    assert aioclient_mock.mock_calls[0][3]["If-None-Match"] == '"forecast-1"'
+    assert smn_data.daily_forecast is daily_forecast
+
+
+async def test_current_weather_not_modified(
+    aioclient_mock: AiohttpClientMocker, smn_data: ArgentinaSMNData, fixture_bytes
+) -> None:
+    """Test a 304 for current weather keeps the previous data."""
+    aioclient_mock.get(
+        WEATHER_URL,
+        content=fixture_bytes("current_weather.json"),
+        headers={"ETag": '"weather-1"'},
+    )
+    await smn_data._fetch_current_weather("4864", {})
+    current_weather = smn_data.current_weather_data
+
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(WEATHER_URL, status=HTTPStatus.NOT_MODIFIED)
+    await smn_data._fetch_current_weather("4864", {})
+
+    assert aioclient_mock.mock_calls[0][3]["If-None-Match"] == '"weather-1"'
+    assert smn_data.current_weather_data is current_weather
+    assert current_weather["temperature"] == 22.5
+
+
+async def test_cached_location_id_skips_lookup(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    mock_config_entry: ConfigEntry,
+) -> None:
+    """Test a location ID cached for the same coordinates is reused."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        data={
+            **mock_config_entry.data,
+            CONF_CACHED_LOCATION_ID: "4864",
+            CONF_CACHED_COORDS: [-34.6217, -58.4258],
+        },
+    )
+
+    coordinator = ArgentinaSMNDataUpdateCoordinator(hass, mock_config_entry)
+
+    assert await coordinator._smn_data._get_location_id() == "4864"
+    assert aioclient_mock.call_count == 0
+
+
+async def test_cached_location_id_invalidated(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    mock_config_entry: ConfigEntry,
+    mock_jwt_token,
+    fixture_bytes,
+) -> None:
+    """Test changed coordinates look the location up again and re-cache it."""
+    mock_config_entry.add_to_hass(hass)
+    hass.config_entries.async_update_entry(
+        mock_config_entry,
+        data={
+            **mock_config_entry.data,
+            CONF_CACHED_LOCATION_ID: "1234",
+            CONF_CACHED_COORDS: [-31.4201, -64.1888],
+        },
+    )
+    aioclient_mock.get(
+        TOKEN_URL,
+        text=f"<script>localStorage.setItem('token', '{mock_jwt_token}');</script>",
+    )
+    aioclient_mock.get(API_COORD_ENDPOINT, content=fixture_bytes("location.json"))
+
+    coordinator = ArgentinaSMNDataUpdateCoordinator(hass, mock_config_entry)
+
+    assert await coordinator._smn_data._get_location_id() == "4864"
+    assert aioclient_mock.call_count == 2
+
+    coordinator._async_cache_location_id()
+    assert mock_config_entry.data[CONF_CACHED_LOCATION_ID] == "4864"
+    assert mock_config_entry.data[CONF_CACHED_COORDS] == [-34.6217, -58.4258]
+
+
+@pytest.mark.parametrize(
+    ("html", "expected"),
+    [
+        ("localStorage.setItem('token', 'eyJabc');", "eyJabc"),
+        ('localStorage.setItem("token","eyJabc");', "eyJabc"),
+        ("localStorage.setItem('token', '');", None),
+        ('{"token": "eyJabc"}', None),
+    ],
+)
+def test_find_token_literal(html: str, expected: str | None) -> None:
+    """Test the token is cut out after a literal localStorage anchor."""
+    assert _find_token_literal(html) == expected
+
+
+async def test_fetch_token_prefers_pattern_order(
+    hass: HomeAssistant,
+    aioclient_mock: AiohttpClientMocker,
+    mock_jwt_token,
+) -> None:
+    """Test the preferred token form wins over one earlier in the page."""
+    # Extra spacing keeps the localStorage call away from the literal anchors
+    aioclient_mock.get(
+        TOKEN_URL,
+        text=(
+            '<script>var config = {"token": "stale"};</script>'
+            f"<script>localStorage.setItem('token',  '{mock_jwt_token}');</script>"
+        ),
+    )
+    session = async_create_clientsession(hass)
+    token_manager = SMNTokenManager(session, async_get_bulkhead(hass))
+
+    assert await token_manager.fetch_token() == mock_jwt_token
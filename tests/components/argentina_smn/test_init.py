@@ -1,34 +1,22 @@
 """Test the SMN integration initialization."""
-from unittest.mock import AsyncMock, patch
-
-import pytest
+import json
+from unittest.mock import AsyncMock, MagicMock, patch
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
 from homeassistant.core import HomeAssistant
-
+from homeassistant.helpers import entity_registry as er
+
+from custom_components.argentina_smn import (
+    _PARSE_CACHE,
+    _parse_alerts,
+    _parse_alerts_cached,
+    async_setup,
+    async_setup_entry,
+    async_unload_entry,
+)
 from custom_components.argentina_smn.const import DOMAIN
 
 
-@pytest.fixture
-def mock_config_entry() -> ConfigEntry:
-    """Return a mock config entry."""
-    return ConfigEntry(
-        version=1,
-        minor_version=1,
-        domain=DOMAIN,
-        title="Ciudad de Buenos Aires",
-        data={
-            CONF_LATITUDE: -34.6217,
-            CONF_LONGITUDE: -58.4258,
-            "name": "Ciudad de Buenos Aires",
-        },
-        source="user",
-        unique_id="4864",
-    )
-
-
-@pytest.mark.asyncio
 async def test_setup_entry(
     hass: HomeAssistant,
     mock_config_entry: ConfigEntry,
@@ -57,7 +45,6 @@ async def test_setup_entry(
         assert mock_config_entry.entry_id in hass.data[DOMAIN]
 
 
-@pytest.mark.asyncio
 async def test_unload_entry(
     hass: HomeAssistant,
     mock_config_entry: ConfigEntry,
@@ -86,88 +73,171 @@ async def test_unload_entry(
             await hass.async_block_till_done()
 
 
-@pytest.mark.asyncio
 async def test_service_get_alerts(
     hass: HomeAssistant,
     mock_config_entry: ConfigEntry,
-    mock_token_manager,
+    mock_smn_data,
     mock_alerts_data,
 ) -> None:
     """Test get_alerts service call."""
     mock_config_entry.add_to_hass(hass)
 
-    with patch(
-        "custom_components.argentina_smn.coordinator.SMNTokenManager"
-    ) as mock_token_class, patch(
-        "custom_components.argentina_smn.coordinator.ArgentinaSMNData"
-    ) as mock_data_class:
-        mock_token_class.return_value = mock_token_manager
-        mock_data_instance = mock_data_class.return_value
-        mock_data_instance.alerts = mock_alerts_data
-        mock_data_instance.fetch_data = AsyncMock()
+    mock_smn_data.alerts = mock_alerts_data
 
-        # Import after patches are set up
-        from custom_components.argentina_smn import async_setup_entry
+    assert await async_setup(hass, {})
+    assert await async_setup_entry(hass, mock_config_entry)
+    await hass.async_block_till_done()
 
-        assert await async_setup_entry(hass, mock_config_entry)
-        await hass.async_block_till_done()
+    # Call the service
+    response = await hass.services.async_call(
+        DOMAIN,
+        "get_alerts",
+        {"config_entry_id": mock_config_entry.entry_id},
+        blocking=True,
+        return_response=True,
+    )
 
-        # Call the service
-        response = await hass.services.async_call(
-            DOMAIN,
-            "get_alerts",
-            {"config_entry_id": mock_config_entry.entry_id},
-            blocking=True,
-            return_response=True,
-        )
+    assert response is not None
+    assert "active_alerts" in response
 
-        assert response is not None
-        assert "active_alerts" in response
+
+async def test_alerts_fetched_once_requested(
+    hass: HomeAssistant,
+    mock_config_entry: ConfigEntry,
+    mock_smn_data,
+) -> None:
+    """Test alerts are skipped while unused and fetched once get_alerts is called."""
+    mock_config_entry.add_to_hass(hass)
+
+    assert await async_setup(hass, {})
+    assert await async_setup_entry(hass, mock_config_entry)
+    await hass.async_block_till_done()
+
+    # Only the short-term alert sensor is left enabled
+    entity_registry = er.async_get(hass)
+    for entity_entry in er.async_entries_for_config_entry(
+        entity_registry, mock_config_entry.entry_id
+    ):
+        if not entity_entry.unique_id.endswith("_shortterm_alert"):
+            entity_registry.async_update_entity(
+                entity_entry.entity_id, disabled_by=er.RegistryEntryDisabler.USER
+            )
+    await hass.async_block_till_done()
+
+    coordinator = hass.data[DOMAIN][mock_config_entry.entry_id]
+    await coordinator.async_refresh()
+    assert mock_smn_data.alerts_required is False
+
+    await hass.services.async_call(
+        DOMAIN,
+        "get_alerts",
+        {"config_entry_id": mock_config_entry.entry_id},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert coordinator.alerts_requested
+    assert mock_smn_data.alerts_required is True
 
 
-@pytest.mark.asyncio
 async def test_service_get_alerts_for_location(
     hass: HomeAssistant,
     mock_config_entry: ConfigEntry,
     mock_token_manager,
+    mock_smn_data,
     mock_alerts_data,
 ) -> None:
     """Test get_alerts_for_location service call."""
     mock_config_entry.add_to_hass(hass)
 
-    with patch(
-        "custom_components.argentina_smn.coordinator.SMNTokenManager"
-    ) as mock_token_class, patch(
-        "custom_components.argentina_smn.coordinator.ArgentinaSMNData"
-    ) as mock_data_class, patch(
-        "aiohttp.ClientSession.get"
-    ) as mock_get:
-        mock_token_class.return_value = mock_token_manager
-        mock_data_instance = mock_data_class.return_value
-        mock_data_instance._session = AsyncMock()
-        mock_data_instance._token_manager = mock_token_manager
-        mock_data_instance.fetch_data = AsyncMock()
-
-        # Mock API response
-        mock_response = AsyncMock()
-        mock_response.json = AsyncMock(return_value=mock_alerts_data)
-        mock_response.raise_for_status = AsyncMock()
-        mock_get.return_value.__aenter__ = AsyncMock(return_value=mock_response)
-        mock_get.return_value.__aexit__ = AsyncMock()
-
-        from custom_components.argentina_smn import async_setup_entry
-
-        assert await async_setup_entry(hass, mock_config_entry)
-        await hass.async_block_till_done()
-
-        # Call the service
-        response = await hass.services.async_call(
-            DOMAIN,
-            "get_alerts_for_location",
-            {"location_id": "4864"},
-            blocking=True,
-            return_response=True,
-        )
-
-        assert response is not None
-        assert "active_alerts" in response
+    mock_smn_data._session = MagicMock()
+    mock_smn_data._token_manager = mock_token_manager
+
+    # Mock API response
+    mock_response = MagicMock()
+    mock_response.read = AsyncMock(
+        return_value=json.dumps(mock_alerts_data).encode()
+    )
+    mock_smn_data._session.get.return_value.__aenter__.return_value = mock_response
+
+    assert await async_setup(hass, {})
+    assert await async_setup_entry(hass, mock_config_entry)
+    await hass.async_block_till_done()
+
+    # Call the service
+    response = await hass.services.async_call(
+        DOMAIN,
+        "get_alerts_for_location",
+        {"location_id": "4864"},
+        blocking=True,
+        return_response=True,
+    )
+
+    assert response is not None
+    assert "active_alerts" in response
+    assert "error" not in response
+    assert response["area_id"] == mock_alerts_data["area_id"]
+
+
+def test_parse_alerts_active(mock_alerts_data_with_active) -> None:
+    """Test alerts are parsed with descriptions from matching reports."""
+    result = _parse_alerts(mock_alerts_data_with_active)
+
+    assert result["max_level"] == 3
+    assert result["max_severity"] == "warning"
+    assert result["area_id"] == 762
+    alerts = {alert.event_name: alert for alert in result["active_alerts"]}
+    assert alerts["tormenta"].description == "Tormentas fuertes"
+    assert alerts["tormenta"].instruction == "Manténgase informado"
+    assert alerts["lluvia"].level_name == "advertencia"
+    assert alerts["lluvia"].description == "Lluvias moderadas"
+
+
+def test_parse_alerts_cached(mock_alerts_data_with_active) -> None:
+    """Test parsed alerts are reused until the data or its stamp changes."""
+    alerts = dict(mock_alerts_data_with_active)
+
+    result = _parse_alerts_cached("test_entry", alerts)
+    parsed = _PARSE_CACHE["test_entry"][2]
+
+    # Each caller gets its own response built from the same parsed alerts
+    second_result = _parse_alerts_cached("test_entry", alerts)
+    assert second_result == result
+    assert second_result is not result
+    assert second_result["active_alerts"] is not result["active_alerts"]
+    assert _PARSE_CACHE["test_entry"][2] is parsed
+
+    alerts["updated"] = "2026-01-01T12:00:00"
+    updated_result = _parse_alerts_cached("test_entry", alerts)
+    assert _PARSE_CACHE["test_entry"][2] is not parsed
+    assert updated_result["updated"] == "2026-01-01T12:00:00"
+
+    _PARSE_CACHE.pop("test_entry")
+
+
+async def test_unload_entry_drops_parsed_alerts(
+    hass: HomeAssistant,
+    mock_config_entry: ConfigEntry,
+    mock_smn_data,
+    mock_alerts_data,
+) -> None:
+    """Test unloading an entry drops its cached alerts response."""
+    mock_config_entry.add_to_hass(hass)
+
+    mock_smn_data.alerts = mock_alerts_data
+
+    assert await async_setup(hass, {})
+    assert await async_setup_entry(hass, mock_config_entry)
+    await hass.async_block_till_done()
+
+    await hass.services.async_call(
+        DOMAIN,
+        "get_alerts",
+        {"config_entry_id": mock_config_entry.entry_id},
+        blocking=True,
+        return_response=True,
+    )
+    assert mock_config_entry.entry_id in _PARSE_CACHE
+
+    assert await async_unload_entry(hass, mock_config_entry)
+    assert mock_config_entry.entry_id not in _PARSE_CACHE
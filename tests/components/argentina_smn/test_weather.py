@@ -1,5 +1,5 @@
 """Test the SMN weather entity."""
-from unittest.mock import AsyncMock, patch
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -7,174 +7,132 @@ from homeassistant.components.weather import (
     ATTR_CONDITION_CLEAR_NIGHT,
     ATTR_CONDITION_SUNNY,
     ATTR_FORECAST_CONDITION,
-    ATTR_FORECAST_NATIVE_TEMP,
-    ATTR_FORECAST_NATIVE_TEMP_LOW,
+    ATTR_FORECAST_TEMP,
+    ATTR_FORECAST_TEMP_LOW,
     ATTR_FORECAST_TIME,
+    DOMAIN as WEATHER_DOMAIN,
+    SERVICE_GET_FORECASTS,
 )
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.const import CONF_LATITUDE, CONF_LONGITUDE
+from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
 
+from custom_components.argentina_smn import async_setup_entry
 from custom_components.argentina_smn.const import DOMAIN
+from custom_components.argentina_smn.weather import format_condition
+
+ENTITY_ID = "weather.ciudad_de_buenos_aires"
 
 
 @pytest.fixture
-def mock_config_entry() -> ConfigEntry:
-    """Return a mock config entry."""
-    return ConfigEntry(
-        version=1,
-        minor_version=1,
-        domain=DOMAIN,
-        title="Ciudad de Buenos Aires",
-        data={
-            CONF_LATITUDE: -34.6217,
-            CONF_LONGITUDE: -58.4258,
-            "name": "Ciudad de Buenos Aires",
-        },
-        source="user",
-        unique_id="4864",
-    )
+async def init_integration(
+    hass: HomeAssistant, mock_config_entry: ConfigEntry, mock_smn_data: MagicMock
+) -> MagicMock:
+    """Set up the integration and return the mocked SMN data."""
+    mock_config_entry.add_to_hass(hass)
+
+    assert await async_setup_entry(hass, mock_config_entry)
+    await hass.async_block_till_done()
+
+    return mock_smn_data
 
 
-@pytest.mark.asyncio
 async def test_weather_entity_state(
     hass: HomeAssistant,
-    mock_config_entry: ConfigEntry,
-    mock_token_manager,
-    mock_current_weather,
+    init_integration: MagicMock,
 ) -> None:
     """Test weather entity reports correct state."""
-    mock_config_entry.add_to_hass(hass)
+    # Get weather entity
+    state = hass.states.get(ENTITY_ID)
+    assert state is not None
+    assert state.state == ATTR_CONDITION_SUNNY
+    assert state.attributes["temperature"] == 22.5
+    assert state.attributes["humidity"] == 65
+    assert state.attributes["pressure"] == 1013.2
+    assert state.attributes["wind_speed"] == 15.5
+    assert state.attributes["wind_bearing"] == 180
+    assert state.attributes["attribution"] == "Data provided by Servicio Meteorológico Nacional Argentina"
+
 
-    with patch(
-        "custom_components.argentina_smn.coordinator.SMNTokenManager"
-    ) as mock_token_class, patch(
-        "custom_components.argentina_smn.coordinator.ArgentinaSMNData"
-    ) as mock_data_class:
-        mock_token_class.return_value = mock_token_manager
-
-        mock_data_instance = mock_data_class.return_value
-        mock_data_instance.current_weather_data = mock_current_weather
-        mock_data_instance.daily_forecast = []
-        mock_data_instance.hourly_forecast = []
-        mock_data_instance.alerts = {}
-        mock_data_instance.shortterm_alerts = []
-        mock_data_instance.heat_warnings = {}
-        mock_data_instance.fetch_data = AsyncMock()
-
-        from custom_components.argentina_smn import async_setup_entry
-
-        assert await async_setup_entry(hass, mock_config_entry)
-        await hass.async_block_till_done()
-
-        # Get weather entity
-        state = hass.states.get("weather.ciudad_de_buenos_aires")
-        assert state is not None
-        assert state.state == ATTR_CONDITION_SUNNY
-        assert state.attributes["temperature"] == 22.5
-        assert state.attributes["humidity"] == 65
-        assert state.attributes["pressure"] == 1013.2
-        assert state.attributes["wind_speed"] == 15.5
-        assert state.attributes["wind_bearing"] == 180
-        assert state.attributes["attribution"] == "Data provided by Servicio Meteorológico Nacional Argentina"
-
-
-@pytest.mark.asyncio
 async def test_weather_entity_forecast(
     hass: HomeAssistant,
-    mock_config_entry: ConfigEntry,
-    mock_token_manager,
-    mock_current_weather,
+    init_integration: MagicMock,
     mock_forecast_data,
 ) -> None:
     """Test weather entity returns forecast."""
-    mock_config_entry.add_to_hass(hass)
-
-    with patch(
-        "custom_components.argentina_smn.coordinator.SMNTokenManager"
-    ) as mock_token_class, patch(
-        "custom_components.argentina_smn.coordinator.ArgentinaSMNData"
-    ) as mock_data_class:
-        mock_token_class.return_value = mock_token_manager
-
-        mock_data_instance = mock_data_class.return_value
-        mock_data_instance.current_weather_data = mock_current_weather
-        mock_data_instance.daily_forecast = mock_forecast_data.get("forecast", [])
-        mock_data_instance.hourly_forecast = []
-        mock_data_instance.alerts = {}
-        mock_data_instance.shortterm_alerts = []
-        mock_data_instance.heat_warnings = {}
-        mock_data_instance.fetch_data = AsyncMock()
-
-        from custom_components.argentina_smn import async_setup_entry
-
-        assert await async_setup_entry(hass, mock_config_entry)
-        await hass.async_block_till_done()
-
-        # Get weather entity
-        state = hass.states.get("weather.ciudad_de_buenos_aires")
-        assert state is not None
+    init_integration.daily_forecast = mock_forecast_data["forecast"]
+
+    response = await hass.services.async_call(
+        WEATHER_DOMAIN,
+        SERVICE_GET_FORECASTS,
+        {"entity_id": ENTITY_ID, "type": "daily"},
+        blocking=True,
+        return_response=True,
+    )
 
-        # Check forecast is present
-        # Note: In HA 2024.x forecast is accessed via service call
-        # For testing purposes we just verify the entity was created with forecast data
+    forecast = response[ENTITY_ID]["forecast"]
+    assert len(forecast) == len(mock_forecast_data["forecast"])
+    assert forecast[1][ATTR_FORECAST_TIME] == "2025-12-31T00:00:00"
+    assert forecast[1][ATTR_FORECAST_TEMP] == 39.0
+    assert forecast[1][ATTR_FORECAST_TEMP_LOW] == 27.0
+    assert all(ATTR_FORECAST_CONDITION in day for day in forecast)
 
 
-@pytest.mark.asyncio
-async def test_weather_condition_mapping(
+async def test_weather_entity_heat_warnings_without_alert_sensors(
     hass: HomeAssistant,
+    init_integration: MagicMock,
+    mock_config_entry: ConfigEntry,
+) -> None:
+    """Test alerts are still fetched when only the weather entity uses them."""
+    entity_registry = er.async_get(hass)
+    for entity_entry in er.async_entries_for_config_entry(
+        entity_registry, mock_config_entry.entry_id
+    ):
+        if entity_entry.domain == Platform.BINARY_SENSOR:
+            entity_registry.async_update_entity(
+                entity_entry.entity_id, disabled_by=er.RegistryEntryDisabler.USER
+            )
+    await hass.async_block_till_done()
+
+    init_integration.heat_warnings = {"area_id": 762, "level": 2}
+    await hass.data[DOMAIN][mock_config_entry.entry_id].async_refresh()
+    await hass.async_block_till_done()
+
+    assert init_integration.alerts_required is True
+    state = hass.states.get(ENTITY_ID)
+    assert state.attributes["heat_warnings"] == {"area_id": 762, "level": 2}
+
+
+@pytest.mark.parametrize(
+    ("weather", "sun_is_up", "expected"),
+    [
+        # Day conditions
+        ({"id": 3, "description": "Despejado"}, True, ATTR_CONDITION_SUNNY),
+        ({"id": 5, "description": "Despejado"}, False, ATTR_CONDITION_CLEAR_NIGHT),
+        # Sunny converted to clear-night at night
+        ({"id": 3, "description": "Despejado"}, False, ATTR_CONDITION_CLEAR_NIGHT),
+        # None handling
+        (None, True, ATTR_CONDITION_SUNNY),
+        (None, False, ATTR_CONDITION_CLEAR_NIGHT),
+        # Invalid dict
+        ({}, True, ATTR_CONDITION_SUNNY),
+        ({"description": "test"}, True, ATTR_CONDITION_SUNNY),
+    ],
+)
+def test_weather_condition_mapping(
+    weather: dict | None, sun_is_up: bool, expected: str
 ) -> None:
     """Test weather condition ID mapping."""
-    from custom_components.argentina_smn.weather import format_condition
-
-    # Test day conditions
-    assert format_condition({"id": 3, "description": "Despejado"}, sun_is_up=True) == ATTR_CONDITION_SUNNY
-    assert format_condition({"id": 5, "description": "Despejado"}, sun_is_up=False) == ATTR_CONDITION_CLEAR_NIGHT
+    assert format_condition(weather, sun_is_up=sun_is_up) == expected
 
-    # Test sunny converted to clear-night at night
-    assert format_condition({"id": 3, "description": "Despejado"}, sun_is_up=False) == ATTR_CONDITION_CLEAR_NIGHT
 
-    # Test None handling
-    assert format_condition(None, sun_is_up=True) == ATTR_CONDITION_SUNNY
-    assert format_condition(None, sun_is_up=False) == ATTR_CONDITION_CLEAR_NIGHT
-
-    # Test invalid dict
-    assert format_condition({}, sun_is_up=True) == ATTR_CONDITION_SUNNY
-    assert format_condition({"description": "test"}, sun_is_up=True) == ATTR_CONDITION_SUNNY
-
-
-@pytest.mark.asyncio
 async def test_weather_entity_name(
     hass: HomeAssistant,
-    mock_config_entry: ConfigEntry,
-    mock_token_manager,
-    mock_current_weather,
+    init_integration: MagicMock,
 ) -> None:
     """Test weather entity uses location name from API."""
-    mock_config_entry.add_to_hass(hass)
-
-    with patch(
-        "custom_components.argentina_smn.coordinator.SMNTokenManager"
-    ) as mock_token_class, patch(
-        "custom_components.argentina_smn.coordinator.ArgentinaSMNData"
-    ) as mock_data_class:
-        mock_token_class.return_value = mock_token_manager
-
-        mock_data_instance = mock_data_class.return_value
-        mock_data_instance.current_weather_data = mock_current_weather
-        mock_data_instance.daily_forecast = []
-        mock_data_instance.hourly_forecast = []
-        mock_data_instance.alerts = {}
-        mock_data_instance.shortterm_alerts = []
-        mock_data_instance.heat_warnings = {}
-        mock_data_instance.fetch_data = AsyncMock()
-
-        from custom_components.argentina_smn import async_setup_entry
-
-        assert await async_setup_entry(hass, mock_config_entry)
-        await hass.async_block_till_done()
-
-        # Get weather entity
-        state = hass.states.get("weather.ciudad_de_buenos_aires")
-        assert state is not None
-        assert state.attributes["friendly_name"] == "Ciudad de Buenos Aires"
+    # Get weather entity
+    state = hass.states.get(ENTITY_ID)
+    assert state is not None
+    assert state.attributes["friendly_name"] == "Ciudad de Buenos Aires"